@@ -27,6 +27,7 @@ args = [
     '--onefile',  # Single executable
     '--windowed',  # No console window
     f'--add-data={os.path.join(BASE_DIR, "Forms", "Ajman-University-Logo.png")}{sep}Forms',
+    f'--add-data={os.path.join(BASE_DIR, "Forms", "templates")}{sep}Forms/templates',
     f'--distpath={os.path.join(BASE_DIR, "dist")}',
     f'--workpath={os.path.join(BASE_DIR, "build")}',
     f'--specpath={BASE_DIR}',
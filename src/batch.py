@@ -0,0 +1,246 @@
+"""
+Batch Form Generation
+Renders one PDF per custodian group from a single Excel workbook, without the GUI
+
+Usage:
+    python src/main.py acknowledgment workbook.xlsx
+    python src/main.py transfer workbook.xlsx
+
+Forms are spread over a pool of worker processes (one per CPU core by default,
+see --workers). Each worker warms up its generator once before taking forms.
+
+The workbook uses the same item/asset columns as the GUI Excel import, plus
+custodian columns. Consecutive or scattered rows that share the same custodian
+are collected into a single form.
+
+Acknowledgment workbook columns:
+    Emp ID | Name | Department | Building | Floor | Section |
+    Store Code | Item Description | Qty | Purchase Date/LPO
+
+Transfer workbook columns:
+    From Emp ID | From Name | From Department | To Emp ID | To Name | To Department |
+    Store Code | Asset Name | Description | Old Asset No.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .pdf.acknowledgment_pdf import AcknowledgmentPDFGenerator
+from .pdf.transfer_pdf import TransferPDFGenerator
+from .utils.excel import ASSET_FIELDS, ITEM_FIELDS, cell_text, iter_sheet_rows
+
+ACK_CUSTODIAN_FIELDS = ["emp_id", "custodian_name", "department", "building",
+                        "building_other", "floor", "floor_other", "section"]
+TRANSFER_CUSTODIAN_FIELDS = ["from_emp_id", "from_name", "from_department",
+                             "to_emp_id", "to_name", "to_department"]
+
+
+def _map_ack_headers(headers: list) -> dict:
+    """Map acknowledgment workbook headers to form fields (case-insensitive)"""
+    header_map = {}
+    for i, h in enumerate(headers):
+        if h is None:
+            continue
+        h_lower = str(h).lower().strip()
+        if "building" in h_lower:
+            header_map["building_other" if "other" in h_lower else "building"] = i
+        elif "floor" in h_lower:
+            header_map["floor_other" if "other" in h_lower else "floor"] = i
+        elif "section" in h_lower:
+            header_map["section"] = i
+        elif "department" in h_lower or "college" in h_lower:
+            header_map["department"] = i
+        elif "store" in h_lower or "code" in h_lower:
+            header_map["store_code"] = i
+        elif "description" in h_lower or "item" in h_lower:
+            header_map["description"] = i
+        elif "qty" in h_lower or "quantity" in h_lower:
+            header_map["qty"] = i
+        elif "date" in h_lower or "lpo" in h_lower or "purchase" in h_lower:
+            header_map["purchase_date"] = i
+        elif "name" in h_lower or "custodian" in h_lower:
+            header_map["custodian_name"] = i
+        elif "emp" in h_lower:
+            header_map["emp_id"] = i
+    return header_map
+
+
+def _map_transfer_headers(headers: list) -> dict:
+    """Map transfer workbook headers to form fields (case-insensitive)"""
+    header_map = {}
+    for i, h in enumerate(headers):
+        if h is None:
+            continue
+        h_lower = str(h).lower().replace("_", " ").strip()
+        words = h_lower.split()
+        prefix = words[0] if words and words[0] in ("from", "to") else None
+
+        if prefix:
+            if "department" in h_lower or "dept" in h_lower:
+                header_map[f"{prefix}_department"] = i
+            elif "name" in h_lower or "custodian" in h_lower:
+                header_map[f"{prefix}_name"] = i
+            elif "emp" in h_lower:
+                header_map[f"{prefix}_emp_id"] = i
+        elif "store" in h_lower or "code" in h_lower:
+            header_map["store_code"] = i
+        elif "asset" in h_lower and "name" in h_lower:
+            header_map["asset_name"] = i
+        elif "description" in h_lower or "desc" in h_lower:
+            header_map["description"] = i
+        elif "old" in h_lower or "asset no" in h_lower:
+            header_map["old_asset_no"] = i
+    return header_map
+
+
+FORM_TYPES = {
+    "acknowledgment": {
+        "generator": AcknowledgmentPDFGenerator,
+        "map_headers": _map_ack_headers,
+        "row_fields": ITEM_FIELDS,
+        "rows_key": "items",
+        "custodian_fields": ACK_CUSTODIAN_FIELDS,
+        "group_by": ("emp_id", "custodian_name"),
+    },
+    "transfer": {
+        "generator": TransferPDFGenerator,
+        "map_headers": _map_transfer_headers,
+        "row_fields": ASSET_FIELDS,
+        "rows_key": "assets",
+        "custodian_fields": TRANSFER_CUSTODIAN_FIELDS,
+        "group_by": ("from_emp_id", "from_name", "to_emp_id", "to_name"),
+    },
+}
+
+
+def read_forms(filepath: str, form_type: str) -> list:
+    """Read a workbook and return one form_data dict per custodian group"""
+    spec = FORM_TYPES[form_type]
+
+    # Rows are streamed from the sheet; only the grouped form data is kept
+    rows = iter_sheet_rows(filepath)
+    try:
+        headers = next(rows, None)
+        if not headers or not any(headers):
+            raise ValueError("No headers found in the Excel file.")
+
+        header_map = spec["map_headers"](list(headers))
+        if not any(field in header_map for field in spec["row_fields"]):
+            raise ValueError("No item columns found in the Excel file.")
+
+        forms = _group_rows(rows, header_map, spec)
+    finally:
+        rows.close()
+
+    return [form_data for form_data in forms.values() if form_data[spec["rows_key"]]]
+
+
+def _group_rows(rows, header_map: dict, spec: dict) -> dict:
+    """Group rows by custodian, keeping the order in which custodians first appear"""
+    forms = {}
+    for row_values in rows:
+        # Skip empty rows
+        if not row_values or not any(row_values):
+            continue
+
+        key = tuple(cell_text(row_values, header_map.get(f)) for f in spec["group_by"])
+        form_data = forms.get(key)
+        if form_data is None:
+            form_data = {f: cell_text(row_values, header_map.get(f)) for f in spec["custodian_fields"]}
+            form_data[spec["rows_key"]] = []
+            forms[key] = form_data
+
+        row_data = {f: cell_text(row_values, header_map.get(f)) for f in spec["row_fields"]}
+        if any(row_data.values()):
+            form_data[spec["rows_key"]].append(row_data)
+    return forms
+
+
+# Generator owned by the current worker process (set by _init_worker)
+_worker_generator = None
+
+
+def _init_worker(form_type: str):
+    """Process pool initializer: build and warm up one generator per worker"""
+    global _worker_generator
+    _worker_generator = FORM_TYPES[form_type]["generator"]()
+    _worker_generator.warm_up()
+
+
+def _generate_one(form_data: dict) -> tuple:
+    """Generate a single form in a worker, returning (filepath, error)"""
+    try:
+        return _worker_generator.generate(form_data), None
+    except Exception as e:
+        return None, str(e)
+
+
+def generate_forms(form_type: str, forms: list, workers: int = None) -> list:
+    """
+    Generate one PDF per form across a pool of worker processes.
+    Returns a (filepath, error) tuple per form, in the same order as forms.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(forms)))
+
+    if workers == 1:
+        # Not worth starting a pool - run in this process
+        _init_worker(form_type)
+        return [_generate_one(form_data) for form_data in forms]
+
+    # Hand out forms in chunks to cut down on inter-process round trips
+    chunksize = max(1, len(forms) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(form_type,)) as executor:
+        return list(executor.map(_generate_one, forms, chunksize=chunksize))
+
+
+def main(argv: list = None) -> int:
+    """Batch command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog="form-filler",
+        description="Generate one PDF per custodian from an Excel workbook."
+    )
+    parser.add_argument("form_type", choices=sorted(FORM_TYPES), help="Type of form to generate")
+    parser.add_argument("workbook", help="Path to the Excel workbook (.xlsx)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: number of CPU cores)")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        forms = read_forms(args.workbook, args.form_type)
+    except Exception as e:
+        print(f"Failed to read Excel file: {e}", file=sys.stderr)
+        return 1
+
+    if not forms:
+        print("No forms to generate.")
+        return 0
+
+    print(f"Generating {len(forms)} {args.form_type} form(s)...")
+    start = time.perf_counter()
+    results = generate_forms(args.form_type, forms, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for index, (filepath, error) in enumerate(results, 1):
+        if error:
+            failed += 1
+            print(f"  Form {index} failed: {error}", file=sys.stderr)
+
+    generated = len(results) - failed
+    rate = generated / elapsed if elapsed > 0 else 0.0
+    print(f"Generated {generated} PDF(s), {failed} failed, "
+          f"in {elapsed:.2f}s ({rate:.1f} forms/sec)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,29 +3,35 @@ Acknowledgment of Receipt Form GUI
 Provides input interface for the acknowledgment form
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import os
-
-from ..pdf.acknowledgment_pdf import AcknowledgmentPDFGenerator
 
-try:
-    from openpyxl import load_workbook
-    EXCEL_SUPPORT = True
-except ImportError:
-    EXCEL_SUPPORT = False
+from .excel_import import ImportProgress
+from .item_grid import ItemGrid
+from ..utils.drafts import DraftJournal
+from ..utils.excel import EXCEL_SUPPORT, ITEM_FIELDS, map_item_headers
+from ..utils.signature import get_drafts_path
 
 
 class AcknowledgmentFormFrame(ttk.Frame):
     """GUI frame for Acknowledgment of Receipt form"""
 
-    def __init__(self, parent):
+    def __init__(self, parent, job_queue):
         super().__init__(parent)
+        self.job_queue = job_queue
         self.items = []
-        self.item_widgets = []
-        self.pdf_generator = AcknowledgmentPDFGenerator()
+        self.pdf_generator = None  # created on first use, on the job queue's worker
+        self.preview = None  # live preview window, while open
+        self.journal = DraftJournal(self.draft_path())
 
         self._create_widgets()
+        self._restore_draft()
+
+    @staticmethod
+    def draft_path() -> str:
+        """Where the form's draft journal is kept"""
+        return os.path.join(get_drafts_path(), "acknowledgment.jsonl")
 
     def _create_widgets(self):
         """Create all form widgets"""
@@ -34,10 +40,8 @@ class AcknowledgmentFormFrame(ttk.Frame):
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self._scrollregion_pending = False
+        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
 
         self.canvas_window = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
@@ -56,6 +60,18 @@ class AcknowledgmentFormFrame(ttk.Frame):
         # Form content
         self._create_form_content()
 
+    def _on_frame_configure(self, event=None):
+        """Update the scroll region when the form content changes size"""
+        # Many changes in a row (e.g. a bulk insert) are coalesced into one update
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        """Recompute the scroll region from the current content"""
+        self._scrollregion_pending = False
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
     def _on_canvas_configure(self, event):
         """Update canvas window width when canvas is resized"""
         self.canvas.itemconfig(self.canvas_window, width=event.width)
@@ -101,17 +117,15 @@ class AcknowledgmentFormFrame(ttk.Frame):
         items_label.grid(row=row, column=0, sticky="w", padx=5, pady=(10, 5))
         row += 1
 
-        # Items header
-        headers = ["Store Code", "Item Description", "Qty", "Purchase Date/LPO", ""]
-        for col, header in enumerate(headers):
-            lbl = ttk.Label(frame, text=header, font=("Helvetica", 10, "bold"))
-            lbl.grid(row=row, column=col, padx=5, pady=2)
-        row += 1
-
-        # Items container
-        self.items_frame = ttk.Frame(frame)
-        self.items_frame.grid(row=row, column=0, columnspan=5, sticky="ew", padx=5)
-        self.items_start_row = row
+        # Items grid - only the rows in view are drawn, cells are edited in place
+        self.items_grid = ItemGrid(frame, [
+            ("store_code", "Store Code", 120),
+            ("description", "Item Description", 300),
+            ("qty", "Qty", 60),
+            ("purchase_date", "Purchase Date/LPO", 140),
+        ])
+        self.items_grid.grid(row=row, column=0, columnspan=6, sticky="ew", padx=5)
+        self.items_grid.tree.bind("<Delete>", lambda e: self._remove_selected_items())
         row += 1
 
         # Add first item row
@@ -121,11 +135,18 @@ class AcknowledgmentFormFrame(ttk.Frame):
         btn_frame = ttk.Frame(frame)
         btn_frame.grid(row=row, column=0, columnspan=5, pady=5, sticky="w", padx=5)
 
-        add_btn = ttk.Button(btn_frame, text="+ Add Item", command=self._add_item_row)
+        add_btn = ttk.Button(btn_frame, text="+ Add Item", command=self._new_item_row)
         add_btn.pack(side="left", padx=(0, 10))
 
-        import_btn = ttk.Button(btn_frame, text="Import from Excel", command=self._import_from_excel)
-        import_btn.pack(side="left")
+        remove_btn = ttk.Button(btn_frame, text="Remove Selected", command=self._remove_selected_items)
+        remove_btn.pack(side="left", padx=(0, 10))
+
+        self.import_btn = ttk.Button(btn_frame, text="Import from Excel", command=self._import_from_excel)
+        self.import_btn.pack(side="left")
+
+        # Shown while an import runs in the background
+        self.import_progress = ImportProgress(btn_frame)
+        self._rows_before_import = None  # grid rows to restore if an import is abandoned
         row += 1
 
         # Separator
@@ -198,50 +219,77 @@ class AcknowledgmentFormFrame(ttk.Frame):
         ttk.Separator(frame, orient="horizontal").grid(row=row, column=0, columnspan=6, sticky="ew", pady=10)
         row += 1
 
-        # Generate button
-        gen_btn = ttk.Button(frame, text="Generate PDF", command=self._generate_pdf,
+        # Generate and Preview buttons
+        action_frame = ttk.Frame(frame)
+        action_frame.grid(row=row, column=0, columnspan=6, pady=20)
+
+        gen_btn = ttk.Button(action_frame, text="Generate PDF", command=self._generate_pdf,
                              style="Accent.TButton")
-        gen_btn.grid(row=row, column=0, columnspan=6, pady=20)
+        gen_btn.pack(side="left", padx=5)
+
+        preview_btn = ttk.Button(action_frame, text="Preview", command=self._show_preview)
+        preview_btn.pack(side="left", padx=5)
 
         # Status label
         row += 1
         self.status_label = ttk.Label(frame, text="")
         self.status_label.grid(row=row, column=0, columnspan=6, pady=5)
 
-    def _add_item_row(self, data: dict = None):
+        self._watch_for_changes()
+
+    def _watch_for_changes(self):
+        """Save the draft and update the preview, while it is open, when a field or item changes"""
+        for widget in self.scrollable_frame.winfo_children():
+            if isinstance(widget, ttk.Entry):  # Comboboxes included
+                widget.bind("<KeyRelease>", self._on_fields_changed, add="+")
+                widget.bind("<<ComboboxSelected>>", self._on_fields_changed, add="+")
+        self.items_grid.bind("<<GridChanged>>", self._on_form_changed)
+
+    def _on_fields_changed(self, event=None):
+        self.journal.record("fields", self._get_fields())
+        self._on_form_changed()
+
+    def _on_form_changed(self, event=None):
+        if self.preview is not None and self.preview.winfo_exists():
+            self.preview.schedule_refresh()
+
+    def _restore_draft(self):
+        """Restore the form as it was left, then journal every edit made to it"""
+        draft = self.journal.load()
+
+        # The journal names rows by item id, so it starts again from the rows as
+        # restored (for a new form, from the grid's empty row)
+        self.items_grid.on_change = self.journal.record
+        self.items_grid.replace_rows(draft["rows"] or list(self.items_grid.rows))
+        self._set_fields(draft["fields"])
+
+        if draft["rows"]:
+            self._on_frame_configure()
+            if self._get_items() or any(draft["fields"].values()):
+                self.status_label.config(text="Restored the unfinished form.", foreground="")
+
+    def _show_preview(self):
+        """Open the live preview window, or bring it to the front"""
+        if self.preview is None or not self.preview.winfo_exists():
+            from .preview import FormPreview  # loads reportlab
+            self.preview = FormPreview(self, "Acknowledgment of Receipt - Preview", self._create_generator,
+                                       self._get_form_data)
+        else:
+            self.preview.lift()
+        self.preview.refresh()
+
+    def _add_item_row(self, data: dict = None) -> str:
         """Add a new item row, optionally with data"""
-        row = len(self.item_widgets)
-
-        store_code = ttk.Entry(self.items_frame, width=15)
-        store_code.grid(row=row, column=0, padx=5, pady=2)
-
-        description = ttk.Entry(self.items_frame, width=35)
-        description.grid(row=row, column=1, padx=5, pady=2)
+        return self.items_grid.add_row(data)
 
-        qty = ttk.Entry(self.items_frame, width=8)
-        qty.grid(row=row, column=2, padx=5, pady=2)
+    def _add_item_rows(self, rows: list):
+        """Add many item rows, laying out the form once afterwards"""
+        self.items_grid.add_rows(rows)
+        self._on_frame_configure()
 
-        purchase_date = ttk.Entry(self.items_frame, width=15)
-        purchase_date.grid(row=row, column=3, padx=5, pady=2)
-
-        remove_btn = ttk.Button(self.items_frame, text="X", width=3,
-                                command=lambda r=row: self._remove_item_row(r))
-        remove_btn.grid(row=row, column=4, padx=5, pady=2)
-
-        # Pre-fill data if provided
-        if data:
-            store_code.insert(0, data.get("store_code", ""))
-            description.insert(0, data.get("description", ""))
-            qty.insert(0, data.get("qty", ""))
-            purchase_date.insert(0, data.get("purchase_date", ""))
-
-        self.item_widgets.append({
-            "store_code": store_code,
-            "description": description,
-            "qty": qty,
-            "purchase_date": purchase_date,
-            "remove_btn": remove_btn
-        })
+    def _new_item_row(self):
+        """Add an empty item row and start editing it"""
+        self.items_grid.edit(self._add_item_row())
 
     def _import_from_excel(self):
         """Import items from Excel file"""
@@ -257,121 +305,68 @@ class AcknowledgmentFormFrame(ttk.Frame):
         if not filepath:
             return
 
-        try:
-            wb = load_workbook(filepath, data_only=True)
-            ws = wb.active
-
-            # Get headers from first row
-            headers = [cell.value for cell in ws[1] if cell.value]
-            if not headers:
-                messagebox.showerror("Error", "No headers found in the Excel file.")
-                return
-
-            # Map headers to our fields (case-insensitive)
-            header_map = {}
-            for i, h in enumerate(headers):
-                h_lower = str(h).lower().strip()
-                if "store" in h_lower or "code" in h_lower:
-                    header_map["store_code"] = i
-                elif "description" in h_lower or "item" in h_lower:
-                    header_map["description"] = i
-                elif "qty" in h_lower or "quantity" in h_lower:
-                    header_map["qty"] = i
-                elif "date" in h_lower or "lpo" in h_lower or "purchase" in h_lower:
-                    header_map["purchase_date"] = i
-
-            # Clear existing items (except first row)
-            for widgets in self.item_widgets[1:]:
-                for widget in widgets.values():
-                    widget.destroy()
-            self.item_widgets = self.item_widgets[:1]
-
-            # Clear first row
-            for key in ["store_code", "description", "qty", "purchase_date"]:
-                self.item_widgets[0][key].delete(0, tk.END)
-
-            # Read data rows
-            items_added = 0
-            for row_num, row in enumerate(ws.iter_rows(min_row=2), 2):
-                row_values = [cell.value for cell in row]
-
-                # Skip empty rows
-                if not any(row_values):
-                    continue
-
-                item_data = {
-                    "store_code": str(row_values[header_map.get("store_code", 0)] or ""),
-                    "description": str(row_values[header_map.get("description", 1)] or ""),
-                    "qty": str(row_values[header_map.get("qty", 2)] or ""),
-                    "purchase_date": str(row_values[header_map.get("purchase_date", 3)] or ""),
-                }
-
-                if items_added == 0:
-                    # Fill first row
-                    self.item_widgets[0]["store_code"].insert(0, item_data["store_code"])
-                    self.item_widgets[0]["description"].insert(0, item_data["description"])
-                    self.item_widgets[0]["qty"].insert(0, item_data["qty"])
-                    self.item_widgets[0]["purchase_date"].insert(0, item_data["purchase_date"])
-                else:
-                    # Add new row
-                    self._add_item_row(item_data)
-
-                items_added += 1
-
-            messagebox.showinfo("Success", f"Imported {items_added} items from Excel.")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import Excel file:\n{str(e)}")
-
-    def _remove_item_row(self, row_index):
-        """Remove an item row"""
-        if len(self.item_widgets) <= 1:
-            messagebox.showwarning("Warning", "At least one item row is required.")
+        # Rows are read on a background thread and added in chunks as they arrive
+        self.import_btn.state(["disabled"])
+        self.import_progress.pack(side="left", padx=(10, 0))
+        self.import_progress.start(filepath, map_item_headers, ITEM_FIELDS,
+                                   self._on_import_start, self._on_import_rows, self._on_import_finished)
+
+    def _on_import_start(self):
+        """Replace the current items once the workbook headers have been read"""
+        # Kept until the import completes, to be put back if it doesn't
+        self._rows_before_import = [dict(row) for row in self.items_grid.rows]
+        self.items_grid.clear()
+
+    def _on_import_rows(self, rows: list):
+        """Add a chunk of imported items"""
+        self._add_item_rows(rows)
+
+    def _on_import_finished(self, count: int, cancelled: bool, error: str):
+        """Report the end of a background import"""
+        self.import_progress.pack_forget()
+        self.import_btn.state(["!disabled"])
+
+        # A cancelled or failed import leaves the items as they were before it
+        rows_before, self._rows_before_import = self._rows_before_import, None
+        if (error or cancelled) and rows_before is not None:
+            self.items_grid.replace_rows(rows_before)
+            self._on_frame_configure()
+
+        if error:
+            messagebox.showerror("Error", f"Failed to import Excel file:\n{error}")
+        elif cancelled:
+            self.status_label.config(text="Import cancelled.", foreground="")
+        else:
+            messagebox.showinfo("Success", f"Imported {count} items from Excel.")
+
+        # Keep one row to type into if nothing was imported
+        if not self.items_grid.rows:
+            self._add_item_row()
+
+    def _remove_selected_items(self):
+        """Remove the selected item rows"""
+        selected = self.items_grid.selection()
+        if not selected:
             return
 
-        widgets = self.item_widgets[row_index]
-        for widget in widgets.values():
-            widget.destroy()
-
-        self.item_widgets.pop(row_index)
+        if len(selected) >= len(self.items_grid.rows):
+            messagebox.showwarning("Warning", "At least one item row is required.")
+            return
 
-        # Reorganize remaining rows
-        for i, widgets in enumerate(self.item_widgets):
-            widgets["store_code"].grid(row=i, column=0)
-            widgets["description"].grid(row=i, column=1)
-            widgets["qty"].grid(row=i, column=2)
-            widgets["purchase_date"].grid(row=i, column=3)
-            widgets["remove_btn"].grid(row=i, column=4)
-            widgets["remove_btn"].configure(command=lambda r=i: self._remove_item_row(r))
+        self.items_grid.remove_rows(selected)
 
     def _get_items(self) -> list:
         """Get all items from the form"""
         items = []
-        for widgets in self.item_widgets:
-            store_code = widgets["store_code"].get().strip()
-            description = widgets["description"].get().strip()
-            qty = widgets["qty"].get().strip()
-            purchase_date = widgets["purchase_date"].get().strip()
-
-            if store_code or description or qty or purchase_date:
-                items.append({
-                    "store_code": store_code,
-                    "description": description,
-                    "qty": qty,
-                    "purchase_date": purchase_date
-                })
+        for row in self.items_grid.rows:
+            item = {field: row[field].strip() for field in self.items_grid.fields}
+            if any(item.values()):
+                items.append(item)
         return items
 
-    def _generate_pdf(self):
-        """Generate the PDF form"""
-        items = self._get_items()
-
-        if not items:
-            messagebox.showwarning("Warning", "Please add at least one item.")
-            return
-
-        form_data = {
-            "items": items,
+    def _get_fields(self) -> dict:
+        """Get the custodian and location fields"""
+        return {
             "custodian_name": self.name_entry.get().strip(),
             "emp_id": self.emp_id_entry.get().strip(),
             "department": self.dept_entry.get().strip(),
@@ -382,39 +377,72 @@ class AcknowledgmentFormFrame(ttk.Frame):
             "section": self.section_var.get(),
         }
 
-        try:
-            filepath = self.pdf_generator.generate(form_data)
-            self.status_label.config(text=f"PDF generated: {filepath}", foreground="green")
-            messagebox.showinfo("Success", f"PDF generated successfully!\n\n{filepath}")
+    def _set_fields(self, fields: dict):
+        """Fill in the custodian and location fields"""
+        for entry, key in [(self.name_entry, "custodian_name"), (self.emp_id_entry, "emp_id"),
+                           (self.dept_entry, "department"), (self.building_other_entry, "building_other"),
+                           (self.floor_other_entry, "floor_other")]:
+            entry.delete(0, tk.END)
+            entry.insert(0, fields.get(key, ""))
+        self.building_var.set(fields.get("building", ""))
+        self.floor_var.set(fields.get("floor", ""))
+        self.section_var.set(fields.get("section", ""))
+
+    def _get_form_data(self) -> dict:
+        """Get the form's current data"""
+        return {"items": self._get_items(), **self._get_fields()}
 
-            # Open the PDF
-            if os.name == 'nt':
-                os.startfile(filepath)
-            elif os.name == 'posix':
-                os.system(f'xdg-open "{filepath}"')
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
-            messagebox.showerror("Error", f"Failed to generate PDF:\n{str(e)}")
+    def _generate_pdf(self):
+        """Generate the PDF form"""
+        self.items_grid.commit_edit()
+        form_data = self._get_form_data()
+
+        if not form_data["items"]:
+            messagebox.showwarning("Warning", "Please add at least one item.")
+            return
+
+        # Generate in the background and clear the form for the next entry
+        label = f"Acknowledgment - {form_data['custodian_name'] or form_data['emp_id'] or 'unnamed'}"
+        self.job_queue.submit(label, self._generate, form_data, restore=self._restore_form)
+        self.clear_form()
+        self.status_label.config(text="PDF queued - see Generated Forms below.", foreground="green")
+
+    def _clear_items(self):
+        """Remove all items, leaving one empty row"""
+        self.items_grid.replace_rows([None])
+
+    def _create_generator(self):
+        """Create a PDF generator (reportlab is only loaded once one is needed)"""
+        from ..pdf.acknowledgment_pdf import AcknowledgmentPDFGenerator
+        return AcknowledgmentPDFGenerator()
+
+    def _generate(self, form_data: dict) -> str:
+        """Generate the PDF (runs on the job queue's worker thread)"""
+        if self.pdf_generator is None:
+            self.pdf_generator = self._create_generator()
+        return self.pdf_generator.generate(form_data)
 
     def clear_form(self):
         """Clear all form fields"""
-        # Clear items
-        for widgets in self.item_widgets[1:]:
-            for widget in widgets.values():
-                widget.destroy()
-        self.item_widgets = self.item_widgets[:1]
-
-        # Clear first item
-        for key in ["store_code", "description", "qty", "purchase_date"]:
-            self.item_widgets[0][key].delete(0, tk.END)
+        # Stop any import still adding items
+        self.import_progress.cancel()
+        self._clear_items()
 
         # Clear other fields
-        self.name_entry.delete(0, tk.END)
-        self.emp_id_entry.delete(0, tk.END)
-        self.dept_entry.delete(0, tk.END)
-        self.building_var.set("")
-        self.building_other_entry.delete(0, tk.END)
-        self.floor_var.set("")
-        self.floor_other_entry.delete(0, tk.END)
-        self.section_var.set("")
+        self._set_fields({})
         self.status_label.config(text="")
+        self._on_fields_changed()
+
+    def _restore_form(self, form_data: dict):
+        """Put back the data of a form that failed to generate"""
+        self.import_progress.cancel()
+        self.items_grid.replace_rows(form_data["items"] or [None])
+        self._on_frame_configure()
+        self._set_fields(form_data)
+        self._on_fields_changed()
+        self.status_label.config(text="Restored the form that failed to generate.", foreground="")
+
+    def destroy(self):
+        # Write out the last edits before the window goes
+        self.journal.close()
+        super().destroy()
@@ -0,0 +1,187 @@
+"""
+Background Excel Import
+Workbooks are parsed on a worker thread and the rows are handed to the Tk
+thread in chunks through a queue polled with after(), so the window stays
+responsive during long imports and they can be cancelled
+"""
+
+import queue
+import threading
+import time
+from tkinter import ttk
+
+
+CHUNK_SIZE = 200         # rows per message from the worker
+MAX_QUEUED_CHUNKS = 10   # the worker waits when the UI falls this far behind
+POLL_INTERVAL = 50       # ms between queue checks while the worker is busy
+POLL_BUDGET = 0.04       # seconds of row handling per poll before yielding to Tk
+
+
+class ExcelImportWorker(threading.Thread):
+    """Reads a workbook on a background thread and queues its rows in chunks"""
+
+    def __init__(self, filepath: str, map_headers, fields: list):
+        super().__init__(daemon=True)
+        self.filepath = filepath
+        self.map_headers = map_headers
+        self.fields = fields
+        self.messages = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Ask the worker to stop; it exits at the next row"""
+        self.cancelled.set()
+
+    def _put(self, kind: str, payload=None) -> bool:
+        """Queue a message, waiting for room. Returns False if cancelled meanwhile."""
+        while not self.cancelled.is_set():
+            try:
+                self.messages.put((kind, payload), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            from ..utils.excel import read_records
+            row_count, records = read_records(self.filepath, self.map_headers, self.fields)
+        except Exception as e:
+            self._put("error", str(e))
+            return
+
+        try:
+            if not self._put("start", row_count):
+                return
+
+            chunk = []
+            for record in records:
+                if self.cancelled.is_set():
+                    return
+                chunk.append(record)
+                if len(chunk) >= CHUNK_SIZE:
+                    if not self._put("rows", chunk):
+                        return
+                    chunk = []
+
+            if chunk and not self._put("rows", chunk):
+                return
+            self._put("done")
+        except Exception as e:
+            self._put("error", str(e))
+        finally:
+            records.close()
+
+
+class ImportProgress(ttk.Frame):
+    """Progress bar and Cancel button for an Excel import running in the background"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._worker = None
+        self._after_id = None
+
+        self.label = ttk.Label(self, text="")
+        self.label.pack(side="left", padx=(0, 5))
+
+        self.progressbar = ttk.Progressbar(self, length=200, mode="determinate")
+        self.progressbar.pack(side="left", padx=(0, 5))
+
+        cancel_btn = ttk.Button(self, text="Cancel", command=self.cancel)
+        cancel_btn.pack(side="left")
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None
+
+    def start(self, filepath: str, map_headers, fields: list, on_start, on_rows, on_finish):
+        """
+        Import filepath in the background. Callbacks run on the Tk thread:
+        on_start() once the headers have been read, on_rows(rows) for each chunk
+        of row dicts, and on_finish(count, cancelled, error) when it ends.
+        """
+        self.cancel()
+
+        self._on_start = on_start
+        self._on_rows = on_rows
+        self._on_finish = on_finish
+        self._count = 0
+        self._total = None
+
+        self.label.config(text="Reading workbook...")
+        self.progressbar.config(mode="indeterminate", value=0)
+        self.progressbar.start()
+
+        self._worker = ExcelImportWorker(filepath, map_headers, fields)
+        self._worker.start()
+        self._after_id = self.after(POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        """Stop the running import, discarding anything not yet delivered"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._finish(cancelled=True)
+
+    def destroy(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        super().destroy()
+
+    def _poll(self):
+        """Deliver queued rows to the UI, for at most POLL_BUDGET per call"""
+        self._after_id = None
+        worker = self._worker
+        deadline = time.monotonic() + POLL_BUDGET
+
+        while time.monotonic() < deadline:
+            try:
+                kind, payload = worker.messages.get_nowait()
+            except queue.Empty:
+                self._after_id = self.after(POLL_INTERVAL, self._poll)
+                return
+
+            try:
+                if kind == "start":
+                    self._total = payload
+                    if payload:
+                        self.progressbar.stop()
+                        self.progressbar.config(mode="determinate", maximum=payload, value=0)
+                    self._on_start()
+                elif kind == "rows":
+                    self._count += len(payload)
+                    self._on_rows(payload)
+                    self._update_progress()
+                elif kind == "done":
+                    self._finish()
+                    return
+                elif kind == "error":
+                    self._finish(error=payload)
+                    return
+            except Exception as e:
+                # Don't leave the worker waiting on a queue nobody reads
+                worker.cancel()
+                self._finish(error=str(e))
+                return
+
+            if self._worker is not worker:
+                # A callback cancelled the import
+                return
+
+        # More rows are waiting - come back as soon as Tk has handled its events
+        self._after_id = self.after(1, self._poll)
+
+    def _update_progress(self):
+        if self._total:
+            self.progressbar.config(value=min(self._count, self._total))
+            self.label.config(text=f"Imported {self._count:,} of {self._total:,} rows")
+        else:
+            self.label.config(text=f"Imported {self._count:,} rows")
+
+    def _finish(self, cancelled: bool = False, error: str = None):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self._worker = None
+        self.progressbar.stop()
+        self._on_finish(self._count, cancelled, error)
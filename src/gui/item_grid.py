@@ -0,0 +1,226 @@
+"""
+Item Grid
+Editable table of item/asset rows built on a ttk.Treeview. Tk only draws the
+rows in view, so the grid stays responsive with tens of thousands of rows.
+Cells are edited in place with a single Entry placed over the active cell.
+The grid generates <<GridChanged>> whenever its rows change, and reports
+each change to an optional on_change callback
+"""
+
+from tkinter import ttk
+
+
+class ItemGrid(ttk.Frame):
+    """Editable grid whose row data is kept in a plain list of dicts"""
+
+    def __init__(self, parent, columns: list, height: int = 10):
+        """columns is a list of (field, heading, width) tuples, width in pixels"""
+        super().__init__(parent)
+        self.fields = [field for field, _, _ in columns]
+        # Treeview item id -> row dict, in display order. Rows are found by id rather
+        # than position, so removing one doesn't renumber the rest
+        self._rows = {}
+        self._editor = None
+        self._editing = None  # (item id, field) of the cell being edited
+
+        # on_change(op, data) is told about every change: "add" ((item id, row dict) pairs
+        # appended), "remove" (item ids), "replace" (all rows as (item id, row dict) pairs)
+        # or "set" ((item id, field, value))
+        self.on_change = None
+
+        self.tree = ttk.Treeview(self, columns=self.fields, show="headings",
+                                 height=height, selectmode="extended")
+        for field, heading, width in columns:
+            self.tree.heading(field, text=heading)
+            self.tree.column(field, width=width, minwidth=40)
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<Return>", self._on_edit_key)
+        self.tree.bind("<F2>", self._on_edit_key)
+
+        # Scroll the grid itself (not the page behind it) while the mouse is over it
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", self._on_mousewheel_linux)
+        self.tree.bind("<Button-5>", self._on_mousewheel_linux)
+
+    @property
+    def rows(self):
+        """Row dicts in display order"""
+        return self._rows.values()
+
+    def _new_row(self, data: dict) -> dict:
+        """Row dict with every field, filled from data where given"""
+        return {field: (data.get(field, "") if data else "") for field in self.fields}
+
+    def _changed(self, op: str, data):
+        if self.on_change is not None:
+            self.on_change(op, data)
+        self.event_generate("<<GridChanged>>")
+
+    def _append_row(self, data: dict) -> str:
+        row = self._new_row(data)
+        row_id = self.tree.insert("", "end", values=[row[field] for field in self.fields])
+        self._rows[row_id] = row
+        return row_id
+
+    def add_row(self, data: dict = None) -> str:
+        """Append a row, optionally with data, and return its item id"""
+        row_id = self._append_row(data)
+        self._changed("add", [(row_id, self._rows[row_id])])
+        return row_id
+
+    def _insert_rows(self, new_rows: list) -> list:
+        """
+        Insert row dicts into the tree and return their item ids in order. Tk walks
+        the whole list to find "end" (or any index but 0), so rows go in at the
+        front; callers put them in place with set_children, a single walk
+        """
+        row_ids = [self.tree.insert("", 0, values=[row[field] for field in self.fields])
+                   for row in reversed(new_rows)]
+        row_ids.reverse()
+        return row_ids
+
+    def add_rows(self, rows):
+        """Append many rows (dicts, or None for an empty row) at once"""
+        if not self._rows:
+            self.replace_rows(rows)
+            return
+        new_rows = [self._new_row(data) for data in rows]
+        row_ids = self._insert_rows(new_rows)
+        self.tree.set_children("", *self._rows, *row_ids)
+        self._rows.update(zip(row_ids, new_rows))
+        self._changed("add", list(zip(row_ids, new_rows)))
+
+    def remove_rows(self, row_ids):
+        """Remove the rows with the given item ids"""
+        self._end_edit()
+        for row_id in row_ids:
+            del self._rows[row_id]
+        self.tree.delete(*row_ids)
+        self._changed("remove", row_ids)
+
+    def clear(self):
+        """Remove all rows"""
+        self.replace_rows([])
+
+    def replace_rows(self, rows):
+        """Replace all rows with new ones (dicts, or None for an empty row) in one step"""
+        self._end_edit()
+        if self._rows:
+            self.tree.delete(*self._rows)
+
+        # Inserted into an empty tree, the rows are already in place
+        new_rows = [self._new_row(data) for data in rows]
+        self._rows = dict(zip(self._insert_rows(new_rows), new_rows))
+        self._changed("replace", list(self._rows.items()))
+
+    def selection(self) -> tuple:
+        """Item ids of the selected rows"""
+        return self.tree.selection()
+
+    def edit(self, row_id: str, field: str = None):
+        """Start editing a cell (the row's first cell by default)"""
+        self._end_edit()
+        field = field or self.fields[0]
+
+        self.tree.see(row_id)
+        self.tree.update_idletasks()
+        bbox = self.tree.bbox(row_id, field)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+
+        self.tree.selection_set(row_id)
+        self.tree.focus(row_id)
+
+        self._editor = ttk.Entry(self.tree)
+        self._editor.insert(0, self._rows[row_id][field])
+        self._editor.select_range(0, "end")
+        self._editor.place(x=x, y=y, width=width, height=height)
+        self._editor.focus_set()
+        self._editing = (row_id, field)
+
+        self._editor.bind("<Return>", lambda e: self._end_edit(refocus=True))
+        self._editor.bind("<KP_Enter>", lambda e: self._end_edit(refocus=True))
+        self._editor.bind("<Escape>", lambda e: self._end_edit(save=False, refocus=True))
+        self._editor.bind("<Tab>", lambda e: self._edit_next(1))
+        self._editor.bind("<Shift-Tab>", lambda e: self._edit_next(-1))
+        self._editor.bind("<ISO_Left_Tab>", lambda e: self._edit_next(-1))
+        self._editor.bind("<FocusOut>", lambda e: self._end_edit())
+
+    def commit_edit(self):
+        """Store the text of a cell that is still being edited"""
+        self._end_edit()
+
+    def _end_edit(self, save: bool = True, refocus: bool = False):
+        """Close the cell editor, storing its text unless save is False"""
+        editor, self._editor = self._editor, None
+        if editor is None:
+            return
+
+        row_id, field = self._editing
+        self._editing = None
+        if save and row_id in self._rows:
+            value = editor.get()
+            if value != self._rows[row_id][field]:
+                self._rows[row_id][field] = value
+                self.tree.set(row_id, field, value)
+                self._changed("set", (row_id, field, value))
+        editor.destroy()
+
+        if refocus:
+            self.tree.focus_set()
+        return "break"
+
+    def _edit_next(self, step: int):
+        """Move the editor to the next (or previous) cell, adding a row after the last one"""
+        row_id, field = self._editing
+        self._end_edit()
+
+        col = self.fields.index(field) + step
+        if 0 <= col < len(self.fields):
+            self.edit(row_id, self.fields[col])
+            return "break"
+
+        next_id = self.tree.next(row_id) if step > 0 else self.tree.prev(row_id)
+        if not next_id and step > 0:
+            next_id = self.add_row()
+        if next_id:
+            self.edit(next_id, self.fields[0] if step > 0 else self.fields[-1])
+        return "break"
+
+    def _on_double_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return
+        row_id = self.tree.identify_row(event.y)
+        col = int(self.tree.identify_column(event.x)[1:]) - 1
+        if row_id and 0 <= col < len(self.fields):
+            self.edit(row_id, self.fields[col])
+
+    def _on_edit_key(self, event):
+        row_id = self.tree.focus()
+        if row_id:
+            self.edit(row_id)
+        return "break"
+
+    def _yview(self, *args):
+        # The editor is placed at fixed coordinates, so close it before scrolling
+        self._end_edit()
+        self.tree.yview(*args)
+
+    def _on_mousewheel(self, event):
+        """Handle mouse wheel scrolling (Windows)"""
+        self._yview("scroll", int(-1 * (event.delta / 120)), "units")
+        return "break"
+
+    def _on_mousewheel_linux(self, event):
+        """Handle mouse wheel scrolling (Linux)"""
+        self._yview("scroll", -1 if event.num == 4 else 1, "units")
+        return "break"
@@ -0,0 +1,161 @@
+"""
+PDF Job Queue
+Forms are generated on a background worker so the window never blocks.
+Each submitted form is listed with its status, and finished PDFs are opened
+with a non-blocking process launch. A failed job keeps its form's data, so it
+can be put back in the form to fix and try again
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import subprocess
+import sys
+from tkinter import ttk, messagebox
+
+
+POLL_INTERVAL = 100  # ms between status checks while jobs are outstanding
+
+
+def open_file(filepath: str):
+    """Open a file with the system's default application without waiting for it"""
+    if os.name == 'nt':
+        os.startfile(filepath)
+    elif sys.platform == 'darwin':
+        subprocess.Popen(["open", filepath])
+    else:
+        subprocess.Popen(["xdg-open", filepath], stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+class JobQueue(ttk.Frame):
+    """List of PDF generation jobs running one at a time in the background"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        # One worker: generation is CPU bound, so more threads would only
+        # compete for the GIL with the UI. Jobs run in submission order.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-job")
+        self._messages = queue.Queue()
+        self._files = {}  # job id -> generated PDF path
+        self._restores = {}  # job id -> (form data, restore) for jobs that can be restored if they fail
+        self._pending = 0
+        self._after_id = None
+
+        title = ttk.Label(self, text="Generated Forms:", font=("Helvetica", 10, "bold"))
+        title.grid(row=0, column=0, sticky="w")
+
+        clear_btn = ttk.Button(self, text="Clear Finished", command=self.clear_finished)
+        clear_btn.grid(row=0, column=1, columnspan=2, sticky="e", pady=(0, 2))
+
+        self.tree = ttk.Treeview(self, columns=("form", "status"), show="headings",
+                                 height=4, selectmode="browse")
+        self.tree.heading("form", text="Form")
+        self.tree.heading("status", text="Status")
+        self.tree.column("form", width=420)
+        self.tree.column("status", width=200)
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.grid(row=1, column=0, columnspan=2, sticky="nsew")
+        scrollbar.grid(row=1, column=2, sticky="ns")
+        self.columnconfigure(0, weight=1)
+
+        # Double-click a finished job to open its PDF again, or a failed one to restore it
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+    def submit(self, label: str, generate, form_data: dict, restore=None):
+        """
+        Queue generate(form_data), which returns the PDF path, under the given label.
+        If it fails, restore(form_data) is offered to put the data back in the form.
+        """
+        job_id = self.tree.insert("", 0, values=(label, "Queued"))
+        future = self._executor.submit(self._run, job_id, generate, form_data)
+        future.add_done_callback(lambda f: self._messages.put((job_id, "finished", f)))
+        if restore is not None:
+            self._restores[job_id] = (form_data, restore)
+
+        self._pending += 1
+        if self._after_id is None:
+            self._after_id = self.after(POLL_INTERVAL, self._poll)
+
+    def _run(self, job_id: str, generate, form_data: dict) -> str:
+        """Runs on the worker thread; status changes go back through the queue"""
+        self._messages.put((job_id, "running", None))
+        return generate(form_data)
+
+    def _poll(self):
+        """Apply status changes from the worker on the Tk thread"""
+        self._after_id = None
+        while True:
+            try:
+                job_id, kind, future = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "running":
+                self.tree.set(job_id, "status", "Generating...")
+            else:
+                self._pending -= 1
+                self._finish(job_id, future)
+
+        if self._pending:
+            self._after_id = self.after(POLL_INTERVAL, self._poll)
+
+    def _finish(self, job_id: str, future):
+        """Show the outcome of a job and open its PDF"""
+        error = future.exception()
+        if error is not None:
+            self.tree.set(job_id, "status", f"Failed: {error}")
+            if job_id not in self._restores:
+                messagebox.showerror("Error", f"Failed to generate PDF:\n{str(error)}")
+            elif messagebox.askyesno("Error", f"Failed to generate PDF:\n{str(error)}\n\n"
+                                     "Put the form's data back to fix it and try again?\n"
+                                     "(You can also double-click the failed form later.)",
+                                     icon="error"):
+                self.restore(job_id)
+            return
+
+        self._restores.pop(job_id, None)
+        filepath = future.result()
+        self._files[job_id] = filepath
+        self.tree.set(job_id, "status", f"Done - {os.path.basename(filepath)}")
+        try:
+            open_file(filepath)
+        except OSError:
+            pass
+
+    def restore(self, job_id: str):
+        """Put a failed job's data back in its form"""
+        form_data, restore = self._restores[job_id]
+        restore(form_data)
+
+    def clear_finished(self):
+        """Remove finished (done or failed) jobs from the list"""
+        for job_id in self.tree.get_children():
+            status = self.tree.set(job_id, "status")
+            if status.startswith(("Done", "Failed")):
+                self._files.pop(job_id, None)
+                self._restores.pop(job_id, None)
+                self.tree.delete(job_id)
+
+    def _on_double_click(self, event):
+        job_id = self.tree.identify_row(event.y)
+        if job_id in self._restores and self.tree.set(job_id, "status").startswith("Failed"):
+            if messagebox.askyesno("Restore Form", "Put this form's data back to fix it and try again?\n"
+                                   "This replaces what is in the form now."):
+                self.restore(job_id)
+        elif job_id in self._files:
+            try:
+                open_file(self._files[job_id])
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to open PDF:\n{str(e)}")
+
+    def destroy(self):
+        # Let queued forms finish writing, without waiting here for them
+        self._executor.shutdown(wait=False)
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
@@ -6,9 +6,35 @@ Provides tabbed interface for form selection
 import tkinter as tk
 from tkinter import ttk
 import sys
+import threading
 
 from .acknowledgment_form import AcknowledgmentFormFrame
+from .job_queue import JobQueue
 from .transfer_form import TransferFormFrame
+from ..utils.drafts import has_draft
+from ..utils.excel import EXCEL_SUPPORT
+
+
+def _prewarm():
+    """Load the PDF and Excel libraries (and PDF resources) ahead of first use"""
+    try:
+        from ..pdf.acknowledgment_pdf import AcknowledgmentPDFGenerator
+        from ..pdf.transfer_pdf import TransferPDFGenerator
+        AcknowledgmentPDFGenerator().warm_up()
+        TransferPDFGenerator().warm_up()
+
+        if EXCEL_SUPPORT:
+            import openpyxl  # noqa: F401
+    except Exception:
+        # Anything that fails here fails again, and is reported, on first real use
+        pass
+
+
+# Notebook tabs: (title, form frame class)
+FORM_TABS = [
+    ("Acknowledgment of Receipt", AcknowledgmentFormFrame),
+    ("Asset Transfer Form (ATF)", TransferFormFrame),
+]
 
 
 class MainWindow:
@@ -95,13 +121,23 @@ class MainWindow:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Acknowledgment Form tab
-        self.ack_frame = AcknowledgmentFormFrame(self.notebook)
-        self.notebook.add(self.ack_frame, text="Acknowledgment of Receipt")
+        # Generated forms, shared by all tabs
+        self.job_queue = JobQueue(self.root)
+        self.job_queue.pack(fill="x", padx=10)
+
+        # Form tabs start as placeholders; each frame is built when first selected,
+        # or straight away if it has an unfinished form to recover
+        self.form_frames = {}  # tab index -> form frame
+        for title, frame_class in FORM_TABS:
+            placeholder = ttk.Frame(self.notebook)
+            ttk.Label(placeholder, text="Loading...").pack(pady=20)
+            self.notebook.add(placeholder, text=title)
 
-        # Transfer Form tab
-        self.transfer_frame = TransferFormFrame(self.notebook)
-        self.notebook.add(self.transfer_frame, text="Asset Transfer Form (ATF)")
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._on_tab_changed()
+        for index, (title, frame_class) in enumerate(FORM_TABS):
+            if index not in self.form_frames and has_draft(frame_class.draft_path()):
+                self._build_tab(index)
 
         # Bottom button bar
         button_frame = ttk.Frame(self.root)
@@ -113,14 +149,38 @@ class MainWindow:
         exit_btn = ttk.Button(button_frame, text="Exit", command=self.root.quit)
         exit_btn.pack(side="right", padx=5)
 
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab's form the first time it is shown"""
+        current_tab = self.notebook.index(self.notebook.select())
+        if current_tab not in self.form_frames:
+            self._build_tab(current_tab)
+
+    def _build_tab(self, index: int):
+        """Replace a tab's placeholder with its form (which restores the form's draft)"""
+        placeholder = self.notebook.nametowidget(self.notebook.tabs()[index])
+        for child in placeholder.winfo_children():
+            child.destroy()
+
+        frame_class = FORM_TABS[index][1]
+        frame = frame_class(placeholder, self.job_queue)
+        frame.pack(fill="both", expand=True)
+        self.form_frames[index] = frame
+
     def _clear_current_form(self):
         """Clear the currently active form"""
         current_tab = self.notebook.index(self.notebook.select())
-        if current_tab == 0:
-            self.ack_frame.clear_form()
-        else:
-            self.transfer_frame.clear_form()
+        frame = self.form_frames.get(current_tab)
+        if frame is not None:
+            frame.clear_form()
 
     def run(self):
         """Start the application"""
+        # Heavy libraries are loaded in the background once the window is up
+        self.root.after(200, lambda: threading.Thread(target=_prewarm, daemon=True).start())
         self.root.mainloop()
+
+        # Exit only stops the main loop; destroying the window lets the forms save their drafts
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass  # already closed from the title bar
@@ -0,0 +1,271 @@
+"""
+Live Form Preview
+Renders the form's display list onto a Tk canvas, one A4 page below the
+other. Edits are picked up on a short debounce timer; only the sections whose
+inputs changed are laid out again, and only their canvas items are redrawn
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from ..pdf.display_list import SectionCache
+
+
+REFRESH_DELAY = 300      # ms after the last edit before the preview is updated
+SCALE = 1.0              # screen pixels per PDF point
+PAGE_GAP = 12            # pixels between pages
+MAX_PREVIEW_PAGES = 20   # pages shown; the rest of a long form is summarised
+
+
+def _tk_color(color) -> str:
+    """Tk colour string for a reportlab colour"""
+    r, g, b = color.rgb()
+    return f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"
+
+
+def _tk_font(font_name: str, size: float) -> tuple:
+    """Tk font for one of the standard PDF fonts, sized in pixels"""
+    family = {"Times": "Times", "Courier": "Courier"}.get(font_name.split("-")[0], "Helvetica")
+    style = font_name.split("-")[1].lower() if "-" in font_name else ""
+    weight = "bold" if "bold" in style else "normal"
+    slant = "italic" if "oblique" in style or "italic" in style else "roman"
+    return (family, -max(1, round(size * SCALE)), weight, slant)
+
+
+class _State:
+    """Graphics state while replaying a display list"""
+
+    __slots__ = ("font", "size", "fill", "stroke", "line_width")
+
+    def __init__(self):
+        self.font = "Helvetica"
+        self.size = 12
+        self.fill = "#000000"
+        self.stroke = "#000000"
+        self.line_width = 1
+
+    def key(self) -> tuple:
+        return (self.font, self.size, self.fill, self.stroke, self.line_width)
+
+    def copy(self) -> "_State":
+        state = _State()
+        state.font, state.size, state.fill, state.stroke, state.line_width = self.key()
+        return state
+
+
+class PreviewCanvas(tk.Canvas):
+    """Tk canvas that draws display lists, keeping the items of unchanged segments"""
+
+    def __init__(self, parent, page_width: float, page_height: float, **kwargs):
+        super().__init__(parent, bg="#808080", highlightthickness=0, **kwargs)
+        self.page_width = page_width * SCALE
+        self.page_height = page_height * SCALE
+        self._page_count = 0
+        self._rendered = {}  # (segment id, start page, start state) -> (segment, tag)
+        self._images = {}    # (image path, width, height) -> PhotoImage
+        self._tag_counter = 0
+
+    def render(self, display_list):
+        """Draw the display list, redrawing only segments that changed or moved"""
+        pages = min(display_list.page_count, MAX_PREVIEW_PAGES)
+        if pages != self._page_count:
+            self._draw_pages(pages, display_list.page_count)
+
+        rendered = {}
+        state = _State()
+        page = 1
+        for segment in display_list.segments:
+            if page > MAX_PREVIEW_PAGES:
+                break
+            key = (id(segment), page, state.key())
+            previous = self._rendered.pop(key, None)
+            if previous is not None:
+                rendered[key] = previous
+                # Replay the state changes only, to know where the next segment starts
+                page = self._draw_ops(segment.ops, state, page, None)
+            else:
+                self._tag_counter += 1
+                tag = f"segment{self._tag_counter}"
+                page = self._draw_ops(segment.ops, state, page, tag)
+                # The segment is kept alive with its tag, so its id can't be reused
+                rendered[key] = (segment, tag)
+
+        # Whatever wasn't reused has changed, moved or gone away
+        for _, tag in self._rendered.values():
+            self.delete(tag)
+        self._rendered = rendered
+
+    def _draw_pages(self, pages: int, total: int):
+        """Draw the blank pages (below everything else) and set the scroll region"""
+        self.delete("page")
+        for i in range(pages):
+            top = self._page_top(i + 1)
+            self.create_rectangle(PAGE_GAP, top, PAGE_GAP + self.page_width, top + self.page_height,
+                                  fill="white", outline="#404040", tags="page")
+        bottom = self._page_top(pages + 1)
+        if total > pages:
+            self.create_text(PAGE_GAP + self.page_width / 2, bottom, anchor="n", fill="white",
+                             text=f"Showing the first {pages} of {total} pages", tags="page")
+            bottom += 2 * PAGE_GAP
+        self.tag_lower("page")
+        self.configure(scrollregion=(0, 0, self.page_width + 2 * PAGE_GAP, bottom))
+        self._page_count = pages
+
+    def _page_top(self, page: int) -> float:
+        return PAGE_GAP + (page - 1) * (self.page_height + PAGE_GAP)
+
+    def _draw_ops(self, ops, state: _State, page: int, tag: str, dx: float = 0, dy: float = 0) -> int:
+        """
+        Replay operations onto the canvas (state changes only if tag is None),
+        with the origin moved by (dx, dy). Returns the page number reached.
+        """
+        top = self._page_top(page)
+
+        def point(x, y):
+            return PAGE_GAP + (x + dx) * SCALE, top + self.page_height - (y + dy) * SCALE
+
+        for name, args, kwargs in ops:
+            if name == "setFont":
+                state.font, state.size = args[0], args[1]
+            elif name == "setFillColor":
+                state.fill = _tk_color(args[0])
+            elif name == "setStrokeColor":
+                state.stroke = _tk_color(args[0])
+            elif name == "setLineWidth":
+                state.line_width = args[0]
+            elif name == "showPage":
+                page += 1
+                top = self._page_top(page)
+                if page > MAX_PREVIEW_PAGES:
+                    tag = None
+            elif tag is None:
+                continue
+            elif name in ("drawString", "drawCentredString", "drawRightString"):
+                x, y = point(args[0], args[1])
+                anchor = {"drawString": "sw", "drawCentredString": "s", "drawRightString": "se"}[name]
+                # Tk anchors text at the bottom of its descent rather than the baseline
+                self.create_text(x, y + 0.2 * state.size * SCALE, text=args[2], anchor=anchor,
+                                 font=_tk_font(state.font, state.size), fill=state.fill, tags=tag)
+            elif name == "line":
+                self.create_line(*point(args[0], args[1]), *point(args[2], args[3]),
+                                 fill=state.stroke, width=state.line_width * SCALE, tags=tag)
+            elif name in ("rect", "circle"):
+                if name == "rect":
+                    x, y, width, height = args
+                    x1, y1 = point(x, y + height)
+                    x2, y2 = point(x + width, y)
+                else:
+                    x, y, r = args
+                    x1, y1 = point(x - r, y + r)
+                    x2, y2 = point(x + r, y - r)
+                create = self.create_rectangle if name == "rect" else self.create_oval
+                create(x1, y1, x2, y2, width=state.line_width * SCALE,
+                       outline=state.stroke if kwargs.get("stroke", 1) else "",
+                       fill=state.fill if kwargs.get("fill", 0) else "", tags=tag)
+            elif name == "fragment":
+                # Fragments run in their own graphics state, like the q/Q pair in the PDF
+                fragment, x, y = args
+                self._draw_ops(fragment.display_list.ops(), state.copy(), page, tag, dx + x, dy + y)
+            elif name == "image":
+                self._draw_image(tag, point, *args, **kwargs)
+        return page
+
+    def _draw_image(self, tag: str, point, image, x, y, width, height, preserveAspectRatio=False, anchor="c"):
+        """Draw a CachedImage, or an outline where it goes if Pillow's Tk support is missing"""
+        from reportlab.lib.boxstuff import aspectRatioFix
+
+        x, y, width, height, _ = aspectRatioFix(preserveAspectRatio, anchor, x, y, width, height,
+                                                image.width, image.height)
+        x1, y1 = point(x, y + height)
+        size = (max(1, round(width * SCALE)), max(1, round(height * SCALE)))
+
+        photo = self._images.get((image.path, size))
+        if photo is None:
+            try:
+                from PIL import Image, ImageTk
+                with Image.open(image.path) as source:
+                    photo = ImageTk.PhotoImage(source.convert("RGBA").resize(size, Image.LANCZOS), master=self)
+            except Exception:
+                photo = False
+            self._images[(image.path, size)] = photo
+
+        if photo:
+            self.create_image(x1, y1, image=photo, anchor="nw", tags=tag)
+        else:
+            self.create_rectangle(x1, y1, x1 + size[0], y1 + size[1], outline="#c0c0c0", tags=tag)
+
+
+class FormPreview(tk.Toplevel):
+    """Window showing how the form being filled in will look as a PDF"""
+
+    def __init__(self, parent, title: str, create_generator, get_form_data):
+        """
+        create_generator() returns a PDF generator for the form (called on first
+        refresh) and get_form_data() returns the form's current data.
+        """
+        super().__init__(parent)
+        self.title(title)
+        self._create_generator = create_generator
+        self._get_form_data = get_form_data
+        self._generator = None
+        self._sections = SectionCache()
+        self._after_id = None
+
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.pack(side="bottom", fill="x", padx=5, pady=2)
+
+        self.canvas = None  # created with the generator's page size
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical")
+        self._scrollbar.pack(side="right", fill="y")
+
+        self.canvas_frame = ttk.Frame(self)
+        self.canvas_frame.pack(side="left", fill="both", expand=True)
+
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", self._on_mousewheel_linux)
+        self.bind("<Button-5>", self._on_mousewheel_linux)
+
+    def schedule_refresh(self):
+        """Refresh the preview once edits have paused for REFRESH_DELAY"""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(REFRESH_DELAY, self.refresh)
+
+    def refresh(self):
+        """Lay out the current form data and update the preview"""
+        self._after_id = None
+        if self._generator is None:
+            self._generator = self._create_generator()
+            width, height = self._generator.width, self._generator.height
+            self.canvas = PreviewCanvas(self.canvas_frame, width, height,
+                                        width=width * SCALE + 2 * PAGE_GAP + 4, height=min(height * SCALE, 700),
+                                        yscrollcommand=self._scrollbar.set)
+            self.canvas.pack(fill="both", expand=True)
+            self._scrollbar.configure(command=self.canvas.yview)
+
+        self._sections.redrawn.clear()
+        try:
+            display_list = self._generator.draw_preview(self._get_form_data(), self._sections)
+        except Exception as e:
+            self.status_label.config(text=f"Preview failed: {e}")
+            return
+
+        self.canvas.render(display_list)
+        pages = display_list.page_count
+        self.status_label.config(text=f"{pages} page{'s' if pages != 1 else ''}")
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
+
+    def _on_mousewheel(self, event):
+        """Handle mouse wheel scrolling (Windows)"""
+        if self.canvas is not None:
+            self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    def _on_mousewheel_linux(self, event):
+        """Handle mouse wheel scrolling (Linux)"""
+        if self.canvas is not None:
+            self.canvas.yview_scroll(-1 if event.num == 4 else 1, "units")
@@ -3,29 +3,35 @@ Asset Transfer Form (ATF) GUI
 Provides input interface for the asset transfer form
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import os
-
-from ..pdf.transfer_pdf import TransferPDFGenerator
 
-try:
-    from openpyxl import load_workbook
-    EXCEL_SUPPORT = True
-except ImportError:
-    EXCEL_SUPPORT = False
+from .excel_import import ImportProgress
+from .item_grid import ItemGrid
+from ..utils.drafts import DraftJournal
+from ..utils.excel import EXCEL_SUPPORT, ASSET_FIELDS, map_asset_headers
+from ..utils.signature import get_drafts_path
 
 
 class TransferFormFrame(ttk.Frame):
     """GUI frame for Asset Transfer Form"""
 
-    def __init__(self, parent):
+    def __init__(self, parent, job_queue):
         super().__init__(parent)
+        self.job_queue = job_queue
         self.assets = []
-        self.asset_widgets = []
-        self.pdf_generator = TransferPDFGenerator()
+        self.pdf_generator = None  # created on first use, on the job queue's worker
+        self.preview = None  # live preview window, while open
+        self.journal = DraftJournal(self.draft_path())
 
         self._create_widgets()
+        self._restore_draft()
+
+    @staticmethod
+    def draft_path() -> str:
+        """Where the form's draft journal is kept"""
+        return os.path.join(get_drafts_path(), "transfer.jsonl")
 
     def _create_widgets(self):
         """Create all form widgets"""
@@ -34,10 +40,8 @@ class TransferFormFrame(ttk.Frame):
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self._scrollregion_pending = False
+        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
 
         self.canvas_window = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
@@ -56,6 +60,18 @@ class TransferFormFrame(ttk.Frame):
         # Form content
         self._create_form_content()
 
+    def _on_frame_configure(self, event=None):
+        """Update the scroll region when the form content changes size"""
+        # Many changes in a row (e.g. a bulk insert) are coalesced into one update
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        """Recompute the scroll region from the current content"""
+        self._scrollregion_pending = False
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
     def _on_canvas_configure(self, event):
         """Update canvas window width when canvas is resized"""
         self.canvas.itemconfig(self.canvas_window, width=event.width)
@@ -126,16 +142,15 @@ class TransferFormFrame(ttk.Frame):
         assets_label.grid(row=row, column=0, columnspan=2, sticky="w", padx=5, pady=(10, 5))
         row += 1
 
-        # Assets header
-        headers = ["Store Code", "Asset Name", "Description", "Old Asset No.", ""]
-        for col, header in enumerate(headers):
-            lbl = ttk.Label(frame, text=header, font=("Helvetica", 10, "bold"))
-            lbl.grid(row=row, column=col, padx=5, pady=2)
-        row += 1
-
-        # Assets container
-        self.assets_frame = ttk.Frame(frame)
-        self.assets_frame.grid(row=row, column=0, columnspan=5, sticky="ew", padx=5)
+        # Assets grid - only the rows in view are drawn, cells are edited in place
+        self.assets_grid = ItemGrid(frame, [
+            ("store_code", "Store Code", 100),
+            ("asset_name", "Asset Name", 150),
+            ("description", "Description", 210),
+            ("old_asset_no", "Old Asset No.", 120),
+        ])
+        self.assets_grid.grid(row=row, column=0, columnspan=6, sticky="ew", padx=5)
+        self.assets_grid.tree.bind("<Delete>", lambda e: self._remove_selected_assets())
         row += 1
 
         # Add first asset row
@@ -145,11 +160,18 @@ class TransferFormFrame(ttk.Frame):
         btn_frame = ttk.Frame(frame)
         btn_frame.grid(row=row, column=0, columnspan=5, pady=5, sticky="w", padx=5)
 
-        add_btn = ttk.Button(btn_frame, text="+ Add Asset", command=self._add_asset_row)
+        add_btn = ttk.Button(btn_frame, text="+ Add Asset", command=self._new_asset_row)
         add_btn.pack(side="left", padx=(0, 10))
 
-        import_btn = ttk.Button(btn_frame, text="Import from Excel", command=self._import_from_excel)
-        import_btn.pack(side="left")
+        remove_btn = ttk.Button(btn_frame, text="Remove Selected", command=self._remove_selected_assets)
+        remove_btn.pack(side="left", padx=(0, 10))
+
+        self.import_btn = ttk.Button(btn_frame, text="Import from Excel", command=self._import_from_excel)
+        self.import_btn.pack(side="left")
+
+        # Shown while an import runs in the background
+        self.import_progress = ImportProgress(btn_frame)
+        self._rows_before_import = None  # grid rows to restore if an import is abandoned
         row += 1
 
         # Separator
@@ -181,50 +203,77 @@ class TransferFormFrame(ttk.Frame):
         ttk.Separator(frame, orient="horizontal").grid(row=row, column=0, columnspan=6, sticky="ew", pady=10)
         row += 1
 
-        # Generate button
-        gen_btn = ttk.Button(frame, text="Generate PDF", command=self._generate_pdf,
+        # Generate and Preview buttons
+        action_frame = ttk.Frame(frame)
+        action_frame.grid(row=row, column=0, columnspan=6, pady=20)
+
+        gen_btn = ttk.Button(action_frame, text="Generate PDF", command=self._generate_pdf,
                              style="Accent.TButton")
-        gen_btn.grid(row=row, column=0, columnspan=6, pady=20)
+        gen_btn.pack(side="left", padx=5)
+
+        preview_btn = ttk.Button(action_frame, text="Preview", command=self._show_preview)
+        preview_btn.pack(side="left", padx=5)
 
         # Status label
         row += 1
         self.status_label = ttk.Label(frame, text="")
         self.status_label.grid(row=row, column=0, columnspan=6, pady=5)
 
-    def _add_asset_row(self, data: dict = None):
+        self._watch_for_changes()
+
+    def _watch_for_changes(self):
+        """Save the draft and update the preview, while it is open, when a field or asset changes"""
+        for widget in self.scrollable_frame.winfo_children():
+            if isinstance(widget, ttk.Entry):  # Comboboxes included
+                widget.bind("<KeyRelease>", self._on_fields_changed, add="+")
+                widget.bind("<<ComboboxSelected>>", self._on_fields_changed, add="+")
+        self.assets_grid.bind("<<GridChanged>>", self._on_form_changed)
+
+    def _on_fields_changed(self, event=None):
+        self.journal.record("fields", self._get_fields())
+        self._on_form_changed()
+
+    def _on_form_changed(self, event=None):
+        if self.preview is not None and self.preview.winfo_exists():
+            self.preview.schedule_refresh()
+
+    def _restore_draft(self):
+        """Restore the form as it was left, then journal every edit made to it"""
+        draft = self.journal.load()
+
+        # The journal names rows by item id, so it starts again from the rows as
+        # restored (for a new form, from the grid's empty row)
+        self.assets_grid.on_change = self.journal.record
+        self.assets_grid.replace_rows(draft["rows"] or list(self.assets_grid.rows))
+        self._set_fields(draft["fields"])
+
+        if draft["rows"]:
+            self._on_frame_configure()
+            if self._get_assets() or any(draft["fields"].values()):
+                self.status_label.config(text="Restored the unfinished form.", foreground="")
+
+    def _show_preview(self):
+        """Open the live preview window, or bring it to the front"""
+        if self.preview is None or not self.preview.winfo_exists():
+            from .preview import FormPreview  # loads reportlab
+            self.preview = FormPreview(self, "Asset Transfer Form (ATF) - Preview", self._create_generator,
+                                       self._get_form_data)
+        else:
+            self.preview.lift()
+        self.preview.refresh()
+
+    def _add_asset_row(self, data: dict = None) -> str:
         """Add a new asset row, optionally with data"""
-        row = len(self.asset_widgets)
-
-        store_code = ttk.Entry(self.assets_frame, width=12)
-        store_code.grid(row=row, column=0, padx=5, pady=2)
-
-        asset_name = ttk.Entry(self.assets_frame, width=18)
-        asset_name.grid(row=row, column=1, padx=5, pady=2)
+        return self.assets_grid.add_row(data)
 
-        description = ttk.Entry(self.assets_frame, width=25)
-        description.grid(row=row, column=2, padx=5, pady=2)
+    def _add_asset_rows(self, rows: list):
+        """Add many asset rows, laying out the form once afterwards"""
+        self.assets_grid.add_rows(rows)
+        self._on_frame_configure()
 
-        old_asset_no = ttk.Entry(self.assets_frame, width=15)
-        old_asset_no.grid(row=row, column=3, padx=5, pady=2)
-
-        remove_btn = ttk.Button(self.assets_frame, text="X", width=3,
-                                command=lambda r=row: self._remove_asset_row(r))
-        remove_btn.grid(row=row, column=4, padx=5, pady=2)
-
-        # Pre-fill data if provided
-        if data:
-            store_code.insert(0, data.get("store_code", ""))
-            asset_name.insert(0, data.get("asset_name", ""))
-            description.insert(0, data.get("description", ""))
-            old_asset_no.insert(0, data.get("old_asset_no", ""))
-
-        self.asset_widgets.append({
-            "store_code": store_code,
-            "asset_name": asset_name,
-            "description": description,
-            "old_asset_no": old_asset_no,
-            "remove_btn": remove_btn
-        })
+    def _new_asset_row(self):
+        """Add an empty asset row and start editing it"""
+        self.assets_grid.edit(self._add_asset_row())
 
     def _import_from_excel(self):
         """Import assets from Excel file"""
@@ -240,160 +289,139 @@ class TransferFormFrame(ttk.Frame):
         if not filepath:
             return
 
-        try:
-            wb = load_workbook(filepath, data_only=True)
-            ws = wb.active
-
-            # Get headers from first row
-            headers = [cell.value for cell in ws[1] if cell.value]
-            if not headers:
-                messagebox.showerror("Error", "No headers found in the Excel file.")
-                return
-
-            # Map headers to our fields (case-insensitive)
-            header_map = {}
-            for i, h in enumerate(headers):
-                h_lower = str(h).lower().strip()
-                if "store" in h_lower or "code" in h_lower:
-                    header_map["store_code"] = i
-                elif "asset" in h_lower and "name" in h_lower:
-                    header_map["asset_name"] = i
-                elif "description" in h_lower or "desc" in h_lower:
-                    header_map["description"] = i
-                elif "old" in h_lower or "asset no" in h_lower:
-                    header_map["old_asset_no"] = i
-
-            # Clear existing assets (except first row)
-            for widgets in self.asset_widgets[1:]:
-                for widget in widgets.values():
-                    widget.destroy()
-            self.asset_widgets = self.asset_widgets[:1]
-
-            # Clear first row
-            for key in ["store_code", "asset_name", "description", "old_asset_no"]:
-                self.asset_widgets[0][key].delete(0, tk.END)
-
-            # Read data rows
-            assets_added = 0
-            for row_num, row in enumerate(ws.iter_rows(min_row=2), 2):
-                row_values = [cell.value for cell in row]
-
-                # Skip empty rows
-                if not any(row_values):
-                    continue
-
-                asset_data = {
-                    "store_code": str(row_values[header_map.get("store_code", 0)] or ""),
-                    "asset_name": str(row_values[header_map.get("asset_name", 1)] or ""),
-                    "description": str(row_values[header_map.get("description", 2)] or ""),
-                    "old_asset_no": str(row_values[header_map.get("old_asset_no", 3)] or ""),
-                }
-
-                if assets_added == 0:
-                    # Fill first row
-                    self.asset_widgets[0]["store_code"].insert(0, asset_data["store_code"])
-                    self.asset_widgets[0]["asset_name"].insert(0, asset_data["asset_name"])
-                    self.asset_widgets[0]["description"].insert(0, asset_data["description"])
-                    self.asset_widgets[0]["old_asset_no"].insert(0, asset_data["old_asset_no"])
-                else:
-                    # Add new row
-                    self._add_asset_row(asset_data)
-
-                assets_added += 1
-
-            messagebox.showinfo("Success", f"Imported {assets_added} assets from Excel.")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import Excel file:\n{str(e)}")
-
-    def _remove_asset_row(self, row_index):
-        """Remove an asset row"""
-        if len(self.asset_widgets) <= 1:
-            messagebox.showwarning("Warning", "At least one asset row is required.")
+        # Rows are read on a background thread and added in chunks as they arrive
+        self.import_btn.state(["disabled"])
+        self.import_progress.pack(side="left", padx=(10, 0))
+        self.import_progress.start(filepath, map_asset_headers, ASSET_FIELDS,
+                                   self._on_import_start, self._on_import_rows, self._on_import_finished)
+
+    def _on_import_start(self):
+        """Replace the current assets once the workbook headers have been read"""
+        # Kept until the import completes, to be put back if it doesn't
+        self._rows_before_import = [dict(row) for row in self.assets_grid.rows]
+        self.assets_grid.clear()
+
+    def _on_import_rows(self, rows: list):
+        """Add a chunk of imported assets"""
+        self._add_asset_rows(rows)
+
+    def _on_import_finished(self, count: int, cancelled: bool, error: str):
+        """Report the end of a background import"""
+        self.import_progress.pack_forget()
+        self.import_btn.state(["!disabled"])
+
+        # A cancelled or failed import leaves the assets as they were before it
+        rows_before, self._rows_before_import = self._rows_before_import, None
+        if (error or cancelled) and rows_before is not None:
+            self.assets_grid.replace_rows(rows_before)
+            self._on_frame_configure()
+
+        if error:
+            messagebox.showerror("Error", f"Failed to import Excel file:\n{error}")
+        elif cancelled:
+            self.status_label.config(text="Import cancelled.", foreground="")
+        else:
+            messagebox.showinfo("Success", f"Imported {count} assets from Excel.")
+
+        # Keep one row to type into if nothing was imported
+        if not self.assets_grid.rows:
+            self._add_asset_row()
+
+    def _remove_selected_assets(self):
+        """Remove the selected asset rows"""
+        selected = self.assets_grid.selection()
+        if not selected:
             return
 
-        widgets = self.asset_widgets[row_index]
-        for widget in widgets.values():
-            widget.destroy()
-
-        self.asset_widgets.pop(row_index)
+        if len(selected) >= len(self.assets_grid.rows):
+            messagebox.showwarning("Warning", "At least one asset row is required.")
+            return
 
-        # Reorganize remaining rows
-        for i, widgets in enumerate(self.asset_widgets):
-            widgets["store_code"].grid(row=i, column=0)
-            widgets["asset_name"].grid(row=i, column=1)
-            widgets["description"].grid(row=i, column=2)
-            widgets["old_asset_no"].grid(row=i, column=3)
-            widgets["remove_btn"].grid(row=i, column=4)
-            widgets["remove_btn"].configure(command=lambda r=i: self._remove_asset_row(r))
+        self.assets_grid.remove_rows(selected)
 
     def _get_assets(self) -> list:
         """Get all assets from the form"""
         assets = []
-        for widgets in self.asset_widgets:
-            store_code = widgets["store_code"].get().strip()
-            asset_name = widgets["asset_name"].get().strip()
-            description = widgets["description"].get().strip()
-            old_asset_no = widgets["old_asset_no"].get().strip()
-
-            if store_code or asset_name or description or old_asset_no:
-                assets.append({
-                    "store_code": store_code,
-                    "asset_name": asset_name,
-                    "description": description,
-                    "old_asset_no": old_asset_no
-                })
+        for row in self.assets_grid.rows:
+            asset = {field: row[field].strip() for field in self.assets_grid.fields}
+            if any(asset.values()):
+                assets.append(asset)
         return assets
 
-    def _generate_pdf(self):
-        """Generate the PDF form"""
-        assets = self._get_assets()
-
-        if not assets:
-            messagebox.showwarning("Warning", "Please add at least one asset.")
-            return
-
-        form_data = {
+    def _get_fields(self) -> dict:
+        """Get the transferred from/to fields"""
+        return {
             "from_name": self.from_name_entry.get().strip(),
             "from_department": self.from_dept_entry.get().strip(),
             "from_emp_id": self.from_emp_id_entry.get().strip(),
             "to_name": self.to_name_entry.get().strip(),
             "to_department": self.to_dept_entry.get().strip(),
             "to_emp_id": self.to_emp_id_entry.get().strip(),
-            "assets": assets
         }
 
-        try:
-            filepath = self.pdf_generator.generate(form_data)
-            self.status_label.config(text=f"PDF generated: {filepath}", foreground="green")
-            messagebox.showinfo("Success", f"PDF generated successfully!\n\n{filepath}")
+    def _set_fields(self, fields: dict):
+        """Fill in the transferred from/to fields"""
+        for entry, key in [(self.from_name_entry, "from_name"), (self.from_dept_entry, "from_department"),
+                           (self.from_emp_id_entry, "from_emp_id"), (self.to_name_entry, "to_name"),
+                           (self.to_dept_entry, "to_department"), (self.to_emp_id_entry, "to_emp_id")]:
+            entry.delete(0, tk.END)
+            entry.insert(0, fields.get(key, ""))
 
-            # Open the PDF
-            if os.name == 'nt':
-                os.startfile(filepath)
-            elif os.name == 'posix':
-                os.system(f'xdg-open "{filepath}"')
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
-            messagebox.showerror("Error", f"Failed to generate PDF:\n{str(e)}")
+    def _get_form_data(self) -> dict:
+        """Get the form's current data"""
+        return {**self._get_fields(), "assets": self._get_assets()}
+
+    def _generate_pdf(self):
+        """Generate the PDF form"""
+        self.assets_grid.commit_edit()
+        form_data = self._get_form_data()
+
+        if not form_data["assets"]:
+            messagebox.showwarning("Warning", "Please add at least one asset.")
+            return
+
+        # Generate in the background and clear the form for the next entry
+        label = f"Transfer - {form_data['from_name'] or form_data['from_emp_id']} to {form_data['to_name'] or form_data['to_emp_id']}"
+        self.job_queue.submit(label, self._generate, form_data, restore=self._restore_form)
+        self.clear_form()
+        self.status_label.config(text="PDF queued - see Generated Forms below.", foreground="green")
+
+    def _clear_assets(self):
+        """Remove all assets, leaving one empty row"""
+        self.assets_grid.replace_rows([None])
+
+    def _create_generator(self):
+        """Create a PDF generator (reportlab is only loaded once one is needed)"""
+        from ..pdf.transfer_pdf import TransferPDFGenerator
+        return TransferPDFGenerator()
+
+    def _generate(self, form_data: dict) -> str:
+        """Generate the PDF (runs on the job queue's worker thread)"""
+        if self.pdf_generator is None:
+            self.pdf_generator = self._create_generator()
+        return self.pdf_generator.generate(form_data)
 
     def clear_form(self):
         """Clear all form fields"""
-        # Clear assets
-        for widgets in self.asset_widgets[1:]:
-            for widget in widgets.values():
-                widget.destroy()
-        self.asset_widgets = self.asset_widgets[:1]
-
-        # Clear first asset
-        for key in ["store_code", "asset_name", "description", "old_asset_no"]:
-            self.asset_widgets[0][key].delete(0, tk.END)
+        # Stop any import still adding assets
+        self.import_progress.cancel()
+        self._clear_assets()
 
         # Clear other fields
-        self.from_name_entry.delete(0, tk.END)
-        self.from_dept_entry.delete(0, tk.END)
-        self.from_emp_id_entry.delete(0, tk.END)
-        self.to_name_entry.delete(0, tk.END)
-        self.to_dept_entry.delete(0, tk.END)
-        self.to_emp_id_entry.delete(0, tk.END)
+        self._set_fields({})
         self.status_label.config(text="")
+        self._on_fields_changed()
+
+    def _restore_form(self, form_data: dict):
+        """Put back the data of a form that failed to generate"""
+        self.import_progress.cancel()
+        self.assets_grid.replace_rows(form_data["assets"] or [None])
+        self._on_frame_configure()
+        self._set_fields(form_data)
+        self._on_fields_changed()
+        self.status_label.config(text="Restored the form that failed to generate.", foreground="")
+
+    def destroy(self):
+        # Write out the last edits before the window goes
+        self.journal.close()
+        super().destroy()
@@ -11,19 +11,29 @@ Features:
 - Dynamic row addition for assets/items
 - Auto-fill current date
 - Digital signature with name and timestamp
+
+Run without arguments to open the GUI, or pass a form type and a workbook
+to generate forms in batch (see src/batch.py):
+    python src/main.py acknowledgment workbook.xlsx
 """
 
+import multiprocessing
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.gui.main_window import MainWindow
-
 
 def main():
     """Main entry point"""
+    if len(sys.argv) > 1:
+        # Headless batch mode - don't load the GUI at all
+        from src.batch import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+
+    from src.gui.main_window import MainWindow
+
     print("Starting Ajman University Form Filler...")
     print("=" * 50)
 
@@ -34,4 +44,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for batch worker processes in the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,171 @@
+"""
+Display Lists
+A recording stand-in for the reportlab canvas. The form drawing code emits
+its primitive operations into a display list, which can be replayed onto a
+reportlab canvas or rendered by the in-app preview. Forms are recorded as a
+sequence of sections, and a SectionCache re-uses a section's recording while
+its inputs and position are unchanged, so only edited sections are re-laid out
+"""
+
+from .text import string_width
+
+
+class Segment:
+    """The operations recorded for one form section"""
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self.ops = []          # (method name, args, kwargs)
+        self.page_breaks = 0   # showPage calls inside the segment
+
+
+class DisplayList:
+    """Canvas-like recorder of drawing operations, grouped into segments"""
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.segments = []
+        self._segment = None
+        self._page = 1
+
+    # Recording
+
+    def _record(self, name: str, *args, **kwargs):
+        if self._segment is None:
+            self._segment = Segment()
+            self.segments.append(self._segment)
+        self._segment.ops.append((name, args, kwargs))
+
+    def record_segment(self, name: str, draw):
+        """Record draw() as a segment of its own and return (segment, draw's result)"""
+        segment = self._segment = Segment(name)
+        self.segments.append(segment)
+        try:
+            result = draw()
+        finally:
+            self._segment = None
+        return segment, result
+
+    def add_segment(self, segment: Segment):
+        """Append a previously recorded segment"""
+        self.segments.append(segment)
+        self._segment = None
+        self._page += segment.page_breaks
+
+    # Canvas interface used by the form drawing code
+
+    def getPageNumber(self) -> int:
+        return self._page
+
+    def stringWidth(self, text: str, font_name: str, font_size: float) -> float:
+        return string_width(text, font_name, font_size)
+
+    def showPage(self):
+        self._record("showPage")
+        self._segment.page_breaks += 1
+        self._page += 1
+
+    def setFont(self, font_name: str, size: float, leading: float = None):
+        self._record("setFont", font_name, size, leading)
+
+    def setFillColor(self, color):
+        self._record("setFillColor", color)
+
+    def setStrokeColor(self, color):
+        self._record("setStrokeColor", color)
+
+    def setLineWidth(self, width: float):
+        self._record("setLineWidth", width)
+
+    def drawString(self, x: float, y: float, text: str):
+        self._record("drawString", x, y, text)
+
+    def drawCentredString(self, x: float, y: float, text: str):
+        self._record("drawCentredString", x, y, text)
+
+    def drawRightString(self, x: float, y: float, text: str):
+        self._record("drawRightString", x, y, text)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self._record("line", x1, y1, x2, y2)
+
+    def rect(self, x: float, y: float, width: float, height: float, stroke: int = 1, fill: int = 0):
+        self._record("rect", x, y, width, height, stroke=stroke, fill=fill)
+
+    def circle(self, x: float, y: float, r: float, stroke: int = 1, fill: int = 0):
+        self._record("circle", x, y, r, stroke=stroke, fill=fill)
+
+    def draw_fragment(self, fragment, x: float, y: float):
+        """Record a StaticFragment drawn with its origin at (x, y)"""
+        self._record("fragment", fragment, x, y)
+
+    def draw_image(self, image, x: float, y: float, width: float, height: float,
+                   preserveAspectRatio: bool = False, anchor: str = "c"):
+        """Record a CachedImage"""
+        self._record("image", image, x, y, width, height,
+                     preserveAspectRatio=preserveAspectRatio, anchor=anchor)
+
+    # Playback
+
+    @property
+    def page_count(self) -> int:
+        return self._page
+
+    def ops(self):
+        """All recorded operations in drawing order"""
+        for segment in self.segments:
+            yield from segment.ops
+
+    def replay(self, c):
+        """Draw the recorded operations onto a reportlab canvas"""
+        for name, args, kwargs in self.ops():
+            if name == "fragment":
+                fragment, x, y = args
+                fragment.draw(c, x, y)
+            elif name == "image":
+                image, *position = args
+                image.draw(c, *position, **kwargs)
+            else:
+                getattr(c, name)(*args, **kwargs)
+
+
+def _freeze(value):
+    """Hashable, immutable snapshot of section inputs (lists and dicts become tuples)"""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class SectionCache:
+    """The last recording of each form section, reused while its inputs are unchanged"""
+
+    def __init__(self):
+        self._sections = {}  # name -> (key, segment, result)
+        self.redrawn = []    # names of the sections recorded by the last layout
+
+    def draw(self, c: DisplayList, name: str, inputs: tuple, y: float, draw):
+        key = (_freeze(inputs), y, c.getPageNumber())
+        cached = self._sections.get(name)
+        if cached is not None and cached[0] == key:
+            _, segment, result = cached
+            c.add_segment(segment)
+            return result
+
+        segment, result = c.record_segment(name, lambda: draw(c, y))
+        self._sections[name] = (key, segment, result)
+        self.redrawn.append(name)
+        return result
+
+
+def draw_section(c, sections: SectionCache, name: str, inputs: tuple, y: float, draw):
+    """
+    Draw one form section with draw(c, y), returning its result. inputs holds
+    everything from the form data the section depends on. Without a section
+    cache (when writing a PDF) the section is simply drawn.
+    """
+    if sections is None:
+        return draw(c, y)
+    return sections.draw(c, name, inputs, y, draw)
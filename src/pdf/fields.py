@@ -0,0 +1,56 @@
+"""
+Interactive PDF Form Fields
+Adds AcroForm widgets to a reportlab canvas while the page is being drawn,
+so documents are written in a single pass without re-parsing
+"""
+
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFDictionary, PDFName, PDFString
+from reportlab.pdfgen import canvas
+
+from .layout import RadioButton, SignatureField
+
+
+def add_signature_field(c: canvas.Canvas, name: str, field: SignatureField):
+    """Add a certificate-based (/Sig) signature field to the current page"""
+    if field.page != c.getPageNumber():
+        raise ValueError(f"Signature field '{name}' is not on the current page")
+
+    form = c.acroForm
+    form.sigFlags = 3  # SignaturesExist | AppendOnly
+
+    sig_field = PDFDictionary({
+        "Type": PDFName("Annot"),
+        "Subtype": PDFName("Widget"),
+        "FT": PDFName("Sig"),
+        "T": PDFString(name),
+        "F": 4,  # Print flag
+        "Rect": PDFArray([int(field.x1), int(field.y1), int(field.x2), int(field.y2)]),
+        "P": c._doc.thisPageRef(),
+    })
+
+    # Add to the page annotations and to the AcroForm fields
+    c._addAnnotation(sig_field)
+    form.fields.append(form.getRef(sig_field))
+
+
+def add_radio_button(c: canvas.Canvas, button: RadioButton):
+    """Add one option of a radio button group to the current page"""
+    if button.page != c.getPageNumber():
+        raise ValueError(f"Radio button '{button.name}' is not on the current page")
+
+    c.acroForm.radio(
+        name=button.group,
+        value=button.name,
+        selected=False,
+        x=button.x,
+        y=button.y,
+        size=button.size,
+        buttonStyle="circle",
+        shape="circle",
+        borderWidth=0,  # The circle itself is part of the page content
+        borderColor=None,
+        fillColor=None,
+        textColor=colors.black,
+        fieldFlags="noToggleToOff radio",
+    )
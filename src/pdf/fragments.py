@@ -0,0 +1,93 @@
+"""
+Static Page Fragments
+Form content that never changes between documents (titles, labels, boxes,
+declaration text) is drawn once on a scratch canvas and the resulting
+content-stream operators are replayed into every document. The drawing
+operations are also kept as a display list for the in-app preview
+"""
+
+import io
+import re
+import threading
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfgen import canvas
+
+from .display_list import DisplayList
+
+
+# reportlab's setFont operator, e.g. "BT /F2 9 Tf 10.8 TL ET"
+_SET_FONT = re.compile(r"^BT (/F\d+) (\S+ Tf \S+ TL ET)$")
+
+
+class StaticFragment:
+    """Pre-compiled drawing operators for invariant content, anchored at the origin"""
+
+    def __init__(self, draw):
+        """
+        Run draw(c) once on a scratch canvas and keep the operators it emits.
+        Whatever draw returns (typically the y the content ends at) is kept as result.
+        """
+        self.display_list = DisplayList(*A4)
+        self.result = draw(self.display_list)
+
+        scratch = canvas.Canvas(io.BytesIO(), pagesize=A4)
+        start = len(scratch._code)
+        self.display_list.replay(scratch)
+
+        # Internal font names (/F1, /F2, ...) depend on the order fonts are first
+        # used in a document, so font operators are re-resolved per document
+        font_names = {internal: name for name, internal in scratch._doc.fontMapping.items()}
+        self._parts = []
+        fonts = []
+        for op in scratch._code[start:]:
+            match = _SET_FONT.match(op)
+            if match:
+                font = font_names[match.group(1)]
+                if font not in fonts:
+                    fonts.append(font)
+                self._parts.append((font, match.group(2)))
+            else:
+                self._parts.append((None, op))
+        self._fonts = tuple(fonts)
+        self._code = {}  # internal font names -> compiled operators
+
+    def _compile(self, internal_names: tuple) -> str:
+        """Join the operators using the given document's internal font names"""
+        lookup = dict(zip(self._fonts, internal_names))
+        return "\n".join(
+            op if font is None else f"BT {lookup[font]} {op}"
+            for font, op in self._parts
+        )
+
+    def draw(self, c: canvas.Canvas, x: float = 0, y: float = 0):
+        """Replay the fragment with its origin moved to (x, y)"""
+        if isinstance(c, DisplayList):
+            c.draw_fragment(self, x, y)
+            return
+
+        internal_names = tuple(c._doc.getInternalFontName(font) for font in self._fonts)
+        code = self._code.get(internal_names)
+        if code is None:
+            code = self._code[internal_names] = self._compile(internal_names)
+
+        # The fragment's graphics state changes are undone by the q/Q pair
+        c._code.append(f"q 1 0 0 1 {fp_str(x)} {fp_str(y)} cm")
+        c._code.append(code)
+        c._code.append("Q")
+
+
+_fragment_cache = {}
+_fragment_cache_lock = threading.Lock()
+
+
+def get_fragment(key, draw) -> StaticFragment:
+    """Get the process-wide fragment for key, compiling it with draw(c) on first use"""
+    fragment = _fragment_cache.get(key)
+    if fragment is None:
+        with _fragment_cache_lock:
+            fragment = _fragment_cache.get(key)
+            if fragment is None:
+                fragment = _fragment_cache[key] = StaticFragment(draw)
+    return fragment
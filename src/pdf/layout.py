@@ -0,0 +1,34 @@
+"""
+Form Layout Results
+Immutable description of a drawn form, passed from the drawing stage to the
+widget stage so generators keep no per-document state
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+
+class SignatureField(NamedTuple):
+    """Signature box position (PDF coordinates) on a 1-based page, and the field's name"""
+    page: int
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    name: str
+
+
+class RadioButton(NamedTuple):
+    """Radio button option position (PDF coordinates) on a 1-based page, and its group"""
+    name: str
+    page: int
+    x: float
+    y: float
+    size: float
+    group: str
+
+
+class FormLayout(NamedTuple):
+    """Result of drawing a form: page count and interactive widget positions"""
+    page_count: int
+    signature: Optional[SignatureField] = None
+    radio_buttons: Tuple[RadioButton, ...] = ()
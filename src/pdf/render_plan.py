@@ -0,0 +1,196 @@
+"""
+Render Plans
+A render plan is a form template compiled down to what drawing it needs:
+page geometry in points, the invariant content of each section as a list of
+canvas operations (replayed through a cached fragment), and the short list of
+data-dependent operations drawn on top of it. Plans are built by
+template.compile_template and loaded with template.load_plan
+"""
+
+from functools import lru_cache
+
+from reportlab.lib import colors
+
+from .display_list import SectionCache, draw_section
+from .fields import add_radio_button, add_signature_field
+from .fragments import get_fragment
+from .layout import FormLayout, RadioButton, SignatureField
+from .resources import get_logo_image
+from .table import Column, Table
+from .text import truncate_text
+from ..utils.signature import get_form_date
+
+
+# Images a template can place, by source name
+IMAGES = {"logo": get_logo_image}
+
+_DRAW_TEXT = {"left": "drawString", "centre": "drawCentredString", "right": "drawRightString"}
+_COLOR_OPS = ("setFillColor", "setStrokeColor")
+
+
+@lru_cache(maxsize=None)
+def _color(value: str):
+    """The shared reportlab colour for a "#RRGGBB" string"""
+    return colors.HexColor(value)
+
+
+class _Section:
+    """One compiled section of a render plan"""
+
+    def __init__(self, plan_key: str, section: dict):
+        self.name = section["name"]
+        self.key = ("template", plan_key, self.name)
+        self.keep = section["keep"]
+        self.min_y = section["min_y"]
+        self.height = section["height"]
+        self.inputs = tuple(section["inputs"])
+        self.images = section["images"]
+        self.static = [
+            (op, (_color(args[0]),) if op in _COLOR_OPS else tuple(args))
+            for op, *args in section["static"]
+        ]
+        self.dynamic = [
+            (op, *args[:5], _color(args[5]), *args[6:]) if op == "field" else (op, *args)
+            for op, *args in section["dynamic"]
+        ]
+
+        self.table = None
+        table = section["table"]
+        if table is not None:
+            self.rows_key = table["key"]
+            self.space_after = table["space_after"]
+            self.table = Table(
+                [Column(*column) for column in table["columns"]], table["x"],
+                header_height=table["header_height"], row_height=table["row_height"],
+                text_offset=table["text_offset"],
+                header_baselines={int(lines): tuple(offsets) for lines, offsets in table["header_baselines"].items()},
+                font=tuple(table["font"]), header_font=tuple(table["header_font"]),
+            )
+
+    def draw_static(self, c, y: float):
+        """Draw the section's invariant content through its cached fragment"""
+        if self.static:
+            get_fragment(self.key, self._replay_static).draw(c, 0, y)
+
+    def _replay_static(self, c):
+        for op, args in self.static:
+            getattr(c, op)(*args)
+
+    def draw_header(self, c, y: float) -> float:
+        """Draw a table section's header row through its cached fragment"""
+        fragment = get_fragment(self.key + ("header",), lambda scratch: self.table.draw_header(scratch, 0))
+        fragment.draw(c, 0, y)
+        return y + fragment.result
+
+
+class RenderPlan:
+    """A compiled form template, ready to draw forms with"""
+
+    def __init__(self, plan: dict):
+        self.name = plan["name"]
+        self.key = plan["hash"]
+        self.width, self.height = plan["page"]
+        self.top = plan["top"]
+        self.bottom = plan["bottom"]
+        self.sections = [_Section(self.key, section) for section in plan["sections"]]
+
+    def draw(self, c, data: dict, sections: SectionCache = None) -> FormLayout:
+        """
+        Draw a form on the canvas and return where its widgets are. data maps the
+        template's field keys to their values ("date" is the form date). Each
+        section is drawn through draw_section with the values it uses.
+        """
+        values = dict(data)
+        values["date"] = get_form_date()
+
+        y = self.top
+        signature = None
+        radio_buttons = []
+        for section in self.sections:
+            inputs = tuple(values.get(key, "") for key in section.inputs)
+            y, buttons, section_signature = draw_section(
+                c, sections, section.name, inputs, y,
+                lambda c, y: self._draw_section(c, y, section, values))
+            radio_buttons.extend(buttons)
+            signature = section_signature or signature
+
+        return FormLayout(c.getPageNumber(), signature, tuple(radio_buttons))
+
+    def add_form_fields(self, c, layout: FormLayout):
+        """Add the interactive radio buttons and digital signature field to the last page"""
+        for radio in layout.radio_buttons:
+            add_radio_button(c, radio)
+        if layout.signature:
+            add_signature_field(c, layout.signature.name, layout.signature)
+
+    def _draw_section(self, c, y: float, section: _Section, values: dict) -> tuple:
+        """Draw one section below y, returning (end y, radio buttons, signature field)"""
+        if section.keep is not None and y - section.keep < self.bottom:
+            c.showPage()
+            y = self.top
+        if section.min_y is not None and y < section.min_y:
+            c.showPage()
+            y = self.top
+
+        if section.table is not None:
+            return self._draw_table(c, y, section, values.get(section.rows_key) or []), (), None
+
+        for source, x, dy, width, height in section.images:
+            image = IMAGES[source]()
+            if image:
+                image.draw(c, x, y + dy, width, height, preserveAspectRatio=True)
+
+        section.draw_static(c, y)
+
+        page = c.getPageNumber()
+        radio_buttons = []
+        signature = None
+        font = fill = None
+        for op, *args in section.dynamic:
+            if op == "field":
+                key, x, dy, font_name, size, color, align, max_width = args
+                text = str(values.get(key, ""))
+                if max_width is not None:
+                    text = truncate_text(text, max_width, font_name, size)
+                if fill is not color:
+                    fill = color
+                    c.setFillColor(color)
+                if font != (font_name, size):
+                    font = (font_name, size)
+                    c.setFont(font_name, size)
+                getattr(c, _DRAW_TEXT[align])(x, y + dy, text)
+            elif op == "choice":
+                key, options, radius, (font_name, size) = args
+                selected = values.get(key, "")
+                for value, cx, cy, other in options:
+                    if value != selected:
+                        continue
+                    fill = _color("#000000")
+                    c.setStrokeColor(fill)
+                    c.setFillColor(fill)
+                    c.circle(cx, y + cy, radius, fill=1)
+                    if other is not None:
+                        other_key, x1, x2, line_dy, text_x, text_dy = other
+                        c.line(x1, y + line_dy, x2, y + line_dy)
+                        if font != (font_name, size):
+                            font = (font_name, size)
+                            c.setFont(font_name, size)
+                        c.drawString(text_x, y + text_dy, str(values.get(other_key, "")))
+            elif op == "radio_button":
+                group, value, x, dy, size = args
+                radio_buttons.append(RadioButton(value, page, x, y + dy, size, group))
+            elif op == "signature":
+                name, x, dy, width, height = args
+                signature = SignatureField(page, x, y + dy, x + width, y + dy + height, name)
+
+        return y - section.height, tuple(radio_buttons), signature
+
+    def _draw_table(self, c, y: float, section: _Section, rows) -> float:
+        """Draw a table section, continuing on new pages (with the header repeated) as needed"""
+        def continue_table(c):
+            c.showPage()
+            return section.draw_header(c, self.top)
+
+        y = section.draw_header(c, y)
+        y = section.table.draw_rows(c, y, rows, self.bottom, self.top, continue_table)
+        return y - section.space_after
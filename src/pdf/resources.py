@@ -0,0 +1,96 @@
+"""
+Shared PDF Resources
+Images are decoded and compressed once per process and then reused by every
+document, instead of reportlab re-reading the file on each drawImage call
+"""
+
+import copy
+import os
+import threading
+
+from reportlab.lib.boxstuff import aspectRatioFix
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase.pdfdoc import PDFImageXObject, PDFObjectReference
+from reportlab.pdfgen import canvas
+
+from .display_list import DisplayList
+
+from ..utils.signature import get_logo_path
+
+
+class CachedImage:
+    """An image XObject that is decoded and compressed once and shared by all documents"""
+
+    def __init__(self, path: str, mask="auto"):
+        self.path = path
+        reader = ImageReader(path)
+
+        # Decode, compress and split out the alpha channel (soft mask) once
+        self.name = _digester(f"{os.path.abspath(path)}{mask}")
+        self.xobject = PDFImageXObject(self.name, reader, mask=mask)
+        self.smask = getattr(self.xobject, "_smask", None)
+        if self.smask is not None:
+            del self.xobject._smask
+        self.width = self.xobject.width
+        self.height = self.xobject.height
+
+    def _register(self, c: canvas.Canvas) -> str:
+        """Add the image to the canvas document once, returning its XObject name"""
+        doc = c._doc
+        reg_name = doc.getXObjectName(self.name)
+        if reg_name in doc.idToObject:
+            return reg_name
+
+        # Documents register (and tag) the objects they reference, so each one
+        # gets a shallow copy - the compressed stream data itself is shared
+        img = copy.copy(self.xobject)
+        doc.Reference(img, reg_name)
+        doc.addForm(self.name, img)
+        if self.smask is not None:
+            mask_name = doc.getXObjectName(self.smask.name)
+            if mask_name not in doc.idToObject:
+                doc.Reference(copy.copy(self.smask), mask_name)
+            img.smask = PDFObjectReference(mask_name)
+        return reg_name
+
+    def draw(self, c: canvas.Canvas, x: float, y: float, width: float, height: float,
+             preserveAspectRatio: bool = False, anchor: str = "c"):
+        """Draw the image like canvas.drawImage, reusing the cached XObject"""
+        if isinstance(c, DisplayList):
+            c.draw_image(self, x, y, width, height, preserveAspectRatio, anchor)
+            return
+
+        reg_name = self._register(c)
+        x, y, width, height, _ = aspectRatioFix(preserveAspectRatio, anchor, x, y, width, height,
+                                                self.width, self.height)
+
+        c._currentPageHasImages = 1
+        c.saveState()
+        c.translate(x, y)
+        c.scale(width, height)
+        c._code.append(f"/{reg_name} Do")
+        c.restoreState()
+        c._formsinuse.append(self.name)
+
+
+_image_cache = {}
+_image_cache_lock = threading.Lock()
+
+
+def get_cached_image(path: str):
+    """Get the process-wide CachedImage for path, or None if it can't be loaded"""
+    with _image_cache_lock:
+        if path not in _image_cache:
+            image = None
+            if os.path.exists(path):
+                try:
+                    image = CachedImage(path)
+                except Exception:
+                    pass
+            _image_cache[path] = image
+        return _image_cache[path]
+
+
+def get_logo_image():
+    """Get the cached Ajman University logo, or None if it isn't available"""
+    return get_cached_image(get_logo_path())
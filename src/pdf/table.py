@@ -0,0 +1,194 @@
+"""
+Table Engine
+Renders the bordered item/asset tables of the forms from a column spec.
+Column positions, text anchors and overflow handling are worked out once per
+table. Each row is measured just before it is drawn: its cells are fitted
+(wrapping text where the column allows it), which gives its height and whether
+it starts a new page. Only the row being drawn is held, so memory use stays
+flat however many rows the table has
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from .text import truncate_text, wrap_text
+
+
+OVERFLOWS = ("clip", "ellipsis", "wrap", "none")
+
+
+class Column(NamedTuple):
+    """
+    One table column. field is the row dict key (None for the row number), align
+    is "left", "centre" or "right", and overflow says what happens to text wider
+    than the column: "clip" (cut at the column edge), "ellipsis" (cut to fit,
+    ending in "..."), "wrap" (continue on more lines, making the row taller)
+    or "none".
+    """
+    field: Optional[str]
+    heading: str
+    width: float
+    align: str = "left"
+    overflow: str = "clip"
+
+
+class TableRow(NamedTuple):
+    """A measured row: its number, the lines of text in each cell and its height"""
+    number: Optional[int]
+    lines: Optional[Tuple[Tuple[str, ...], ...]]
+    height: float
+
+
+class Table:
+    """A table layout that draws headers and rows for any number of pages"""
+
+    def __init__(self, columns: list, x: float, header_height: float, row_height: float,
+                 text_offset: float, header_baselines: dict, font: tuple = ("Helvetica", 9),
+                 header_font: tuple = ("Helvetica-Bold", 9), padding: float = 0.04 * inch,
+                 line_height: float = None):
+        """
+        columns is a list of Columns, starting at x. row_height is the height of a
+        one-line row, and each extra line of wrapped text adds line_height (the font
+        size * 1.2 by default). text_offset is the distance from the top of a row to
+        the first baseline, and header_baselines maps the number of lines in a
+        heading to the baseline offset of each line.
+        """
+        self.columns = columns
+        self.x = x
+        self.header_height = header_height
+        self.row_height = row_height
+        self.text_offset = text_offset
+        self.header_baselines = header_baselines
+        self.font = font
+        self.header_font = header_font
+        self.line_height = line_height if line_height is not None else font[1] * 1.2
+
+        # Per column: (x, width, field, text x, alignment, function giving the lines of a cell)
+        self._cells = []
+        for column in columns:
+            if column.align not in ("left", "centre", "right"):
+                raise ValueError(f"Unknown alignment '{column.align}'")
+            if column.align == "centre":
+                text_x = x + column.width / 2
+            elif column.align == "right":
+                text_x = x + column.width - padding
+            else:
+                text_x = x + padding
+            fit = self._text_fitter(column, padding)
+            self._cells.append((x, column.width, column.field, text_x, column.align, fit))
+            x += column.width
+
+    def _text_fitter(self, column: Column, padding: float):
+        """The function that turns a cell's text into the tuple of lines drawn in it"""
+        font_name, font_size = self.font
+        max_width = column.width - 2 * padding
+        if column.overflow == "clip":
+            return lambda text: (truncate_text(text, max_width, font_name, font_size, suffix=""),)
+        if column.overflow == "ellipsis":
+            return lambda text: (truncate_text(text, max_width, font_name, font_size),)
+        if column.overflow == "wrap":
+            def fit(text):
+                lines = wrap_text(text, font_name, font_size, max_width)
+                # Only a single word too long for the column can overrun it
+                return tuple(truncate_text(line, max_width, font_name, font_size, suffix="")
+                             for line in lines) or ("",)
+            return fit
+        if column.overflow == "none":
+            return lambda text: (text,)
+        raise ValueError(f"Unknown overflow policy '{column.overflow}'")
+
+    def draw_header(self, c, y: float) -> float:
+        """Draw the header row below y and return the y below it"""
+        c.setStrokeColor(colors.black)
+        c.setFillColor(colors.black)
+        c.setFont(*self.header_font)
+
+        header_height = self.header_height
+        for (x, width, _, _, _, _), column in zip(self._cells, self.columns):
+            c.rect(x, y - header_height, width, header_height)
+            lines = column.heading.split("\n")
+            for line, offset in zip(lines, self.header_baselines[len(lines)]):
+                c.drawCentredString(x + width / 2, y - offset, line)
+
+        return y - header_height
+
+    def layout(self, rows, y: float, bottom: float, continued_y: float):
+        """
+        Measurement pass, run lazily as the rows are drawn: fit the text of each
+        cell and work out where pages break. Rows start at y on the first page and
+        at continued_y on the pages after, and a page ends where the next row would
+        go below bottom. Yields (starts a new page, TableRow) for each row, or for
+        one empty row if there are no rows.
+        """
+        cells = [(field, fit) for _, _, field, _, _, fit in self._cells]
+        row_height = self.row_height
+        line_height = self.line_height
+        # Wrapped text is cut short where even a page of its own couldn't hold the row
+        max_lines = max(1, int((continued_y - bottom - row_height) / line_height) + 1)
+
+        first_page = True
+        page_rows = 0  # rows on the current page
+        number = 0
+        for row in rows:
+            number += 1
+            lines = tuple(fit(str(number) if field is None else row.get(field, "")) for field, fit in cells)
+            line_count = max(map(len, lines))
+            if line_count > max_lines:
+                lines = tuple(cell[:max_lines] for cell in lines)
+                line_count = max_lines
+            height = row_height + (line_count - 1) * line_height
+
+            # Never leave a continuation page empty, whatever the row's height
+            new_page = y - height < bottom and (page_rows or first_page)
+            if new_page:
+                first_page = False
+                page_rows = 0
+                y = continued_y
+            yield new_page, TableRow(number, lines, height)
+            page_rows += 1
+            y -= height
+
+        if not number:
+            yield False, TableRow(None, None, row_height)
+
+    def draw_rows(self, c, y: float, rows, bottom: float, page_top: float, continue_table) -> float:
+        """
+        Draw rows (any iterable of dicts) below y, or one empty row if there are
+        none, and return the y below the last. Rows don't go below bottom; the
+        table continues on new pages, started by continue_table(c), which draws the
+        header at page_top and returns the y below it.
+        """
+        c.setStrokeColor(colors.black)
+        c.setFillColor(colors.black)
+        c.setFont(*self.font)
+
+        draw_text = {"left": c.drawString, "centre": c.drawCentredString, "right": c.drawRightString}
+        cells = [(x, width, text_x, draw_text[align]) for x, width, _, text_x, align, _ in self._cells]
+
+        for new_page, table_row in self.layout(rows, y, bottom, page_top - self.header_height):
+            if new_page:
+                y = continue_table(c)
+                c.setFont(*self.font)
+            self._draw_row(c, y, cells, table_row)
+            y -= table_row.height
+
+        return y
+
+    def _draw_row(self, c, y: float, cells: list, table_row: TableRow):
+        """Draw one measured row below y"""
+        height = table_row.height
+        row_y = y - height
+        text_y = y - self.text_offset
+        line_height = self.line_height
+        if table_row.lines is None:
+            for x, width, _, _ in cells:
+                c.rect(x, row_y, width, height)
+            return
+
+        for (x, width, text_x, draw_text), lines in zip(cells, table_row.lines):
+            c.rect(x, row_y, width, height)
+            draw_text(text_x, text_y, lines[0])
+            for i in range(1, len(lines)):
+                draw_text(text_x, text_y - i * line_height, lines[i])
@@ -0,0 +1,460 @@
+"""
+Form Templates
+Forms are described by JSON templates (in Forms/templates): page margins, then
+a list of sections made of static text, lines, boxes, paragraphs, data fields,
+radio groups, tables and a signature box. A template is compiled once into a
+render plan - lengths resolved to points, paragraphs wrapped, page-break space
+worked out and the invariant content split from the data-dependent content -
+and the plan is cached on disk under the template's hash, so a form's layout
+is only ever worked out again when its template changes.
+
+Lengths are in inches. Horizontal positions can also name a point on the page
+and add or subtract from it, e.g. "margin + 0.45", "right - 2.3", "centre";
+vertical positions ("dy") are relative to the section's current line, which
+"space" elements and paragraphs move down the page.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+
+from .render_plan import IMAGES, RenderPlan
+from .table import OVERFLOWS
+from .text import wrap_text
+from ..utils.signature import get_cache_path, get_templates_path
+
+
+PLAN_VERSION = 2  # bump when the compiled plan format or the compiler's output changes
+
+PAGE_SIZES = {"A4": A4}
+ALIGNMENTS = ("left", "centre", "right")
+DEFAULT_FONT = ("Helvetica", 10)
+DEFAULT_COLORS = {"black": "#000000", "white": "#FFFFFF"}
+DEFAULT_RADIO = {"offset": [0.08, 0.04], "radius": 0.065, "dot": 0.035, "widget": 0.18}
+
+_TERM = re.compile(r"\s*([+-]?)\s*([A-Za-z_]+|\d+(?:\.\d*)?|\.\d+)\s*")
+_DRAW_TEXT = {"left": "drawString", "centre": "drawCentredString", "right": "drawRightString"}
+
+
+class TemplateError(ValueError):
+    """A form template that can't be compiled"""
+
+
+class _Ops:
+    """Static canvas operations for one section, skipping redundant state changes"""
+
+    def __init__(self):
+        self.ops = []
+        self._state = {}
+
+    def _set(self, op: str, *args):
+        if self._state.get(op) != args:
+            self._state[op] = args
+            self.ops.append([op, *args])
+
+    def font(self, font: tuple):
+        self._set("setFont", *font)
+
+    def fill(self, color: str):
+        self._set("setFillColor", color)
+
+    def stroke(self, color: str):
+        self._set("setStrokeColor", color)
+
+    def line_width(self, width: float):
+        self._set("setLineWidth", width)
+
+    def draw(self, op: str, *args):
+        self.ops.append([op, *args])
+
+
+class _Compiler:
+    """Compiles one template (a parsed JSON document) into a plan dict"""
+
+    def __init__(self, name: str, template: dict):
+        self.name = name
+        self.template = template
+
+        page = template.get("page", {})
+        size = page.get("size", "A4")
+        if size not in PAGE_SIZES:
+            raise TemplateError(f"{name}: unknown page size '{size}'")
+        self.width, self.height = PAGE_SIZES[size]
+        self.margin = page.get("margin", 0.75) * inch
+        self.top = self.height - page.get("top_margin", page.get("margin", 0.75)) * inch
+        self.bottom = page.get("bottom_margin", 0.5) * inch
+        self.positions = {"left": 0, "margin": self.margin, "centre": self.width / 2, "right": self.width}
+
+        self.colors = dict(DEFAULT_COLORS, **template.get("colors", {}))
+        radio = dict(DEFAULT_RADIO, **template.get("radio", {}))
+        self.radio_offset = (radio["offset"][0] * inch, radio["offset"][1] * inch)
+        self.radio_radius = radio["radius"] * inch
+        self.radio_dot = radio["dot"] * inch
+        self.radio_widget = radio["widget"] * inch
+
+    def compile(self) -> dict:
+        sections = self.template.get("sections")
+        if not sections:
+            raise TemplateError(f"{self.name}: the template has no sections")
+        names = [section.get("name") for section in sections]
+        if None in names or len(set(names)) != len(names):
+            raise TemplateError(f"{self.name}: every section needs a unique name")
+
+        compiled = [self._section(section) for section in sections]
+
+        # "keep": "rest" keeps a section and everything after it on one page. Worked
+        # out from the end, so a later "rest" is already resolved when it is needed
+        for i in reversed(range(len(sections))):
+            if sections[i].get("keep") == "rest":
+                rest = compiled[i:]
+                if any(s["table"] is not None for s in rest):
+                    raise TemplateError(f"{self.name}: section '{compiled[i]['name']}' can't keep a table together")
+                compiled[i]["keep"] = self._rest_height(rest)
+
+        return {
+            "version": PLAN_VERSION,
+            "name": self.name,
+            "page": [self.width, self.height],
+            "top": self.top,
+            "bottom": self.bottom,
+            "sections": compiled,
+        }
+
+    def _rest_height(self, rest: list) -> float:
+        """
+        The room a run of sections needs below its top for none of them to start
+        a new page: each must fit above the bottom margin, or pass its own
+        keep check, or start above its min_y (which may leave it running into
+        the margin, as the signature box does)
+        """
+        needed = 0
+        offset = 0  # from the top of the run to the top of the section
+        for section in rest:
+            if section["keep"] is not None:
+                below = section["keep"]
+            elif section["min_y"] is not None:
+                below = section["min_y"] - self.bottom
+            else:
+                below = section["height"]
+            needed = max(needed, offset + below)
+            offset += section["height"]
+        return needed
+
+    # Values
+
+    def _x(self, value) -> float:
+        """A horizontal position or width: inches, optionally added to a named position"""
+        if isinstance(value, (int, float)):
+            return value * inch
+        if not isinstance(value, str):
+            raise TemplateError(f"{self.name}: bad length {value!r}")
+
+        total = 0
+        pos = 0
+        while pos < len(value):
+            match = _TERM.match(value, pos)
+            if not match or (pos and not match.group(1)):
+                raise TemplateError(f"{self.name}: bad length {value!r}")
+            sign, term = match.groups()
+            if term[0].isalpha():
+                if term not in self.positions:
+                    raise TemplateError(f"{self.name}: unknown position '{term}' in {value!r}")
+                amount = self.positions[term]
+            else:
+                amount = float(term) * inch
+            total = total - amount if sign == "-" else total + amount
+            pos = match.end()
+        return total
+
+    def _color(self, value: str) -> str:
+        """A colour name from the template's colours, or "#RRGGBB", as "#RRGGBB\""""
+        value = self.colors.get(value, value)
+        try:
+            return "#" + colors.HexColor(value).hexval()[2:].upper()
+        except (ValueError, TypeError):
+            raise TemplateError(f"{self.name}: bad colour {value!r}") from None
+
+    def _font(self, element: dict) -> tuple:
+        name, size = element.get("font", DEFAULT_FONT)
+        return name, size
+
+    def _align(self, element: dict) -> str:
+        align = element.get("align", "left")
+        if align not in ALIGNMENTS:
+            raise TemplateError(f"{self.name}: unknown alignment '{align}'")
+        return align
+
+    # Sections
+
+    def _section(self, section: dict) -> dict:
+        name = section["name"]
+        keep = section.get("keep")
+        min_y = section.get("min_y")
+        plan = {
+            "name": name,
+            "keep": keep * inch if isinstance(keep, (int, float)) else None,
+            "min_y": min_y * inch if min_y is not None else None,
+            "height": 0,
+            "inputs": [],
+            "images": [],
+            "static": [],
+            "dynamic": [],
+            "table": None,
+        }
+
+        if section.get("type") == "table":
+            plan["table"] = self._table(section)
+            plan["inputs"] = [section["key"]]
+            return plan
+
+        ops = _Ops()
+        y = 0  # the section's current line, relative to its top
+        for element in section.get("elements", []):
+            kind = element.get("type")
+            handler = getattr(self, f"_{kind}", None) if kind in _ELEMENTS else None
+            if handler is None:
+                raise TemplateError(f"{self.name}: unknown element type '{kind}' in section '{name}'")
+            y = handler(element, y, ops, plan)
+
+        plan["height"] = -y
+        plan["static"] = ops.ops
+        return plan
+
+    def _table(self, section: dict) -> dict:
+        columns = []
+        for column in section["columns"]:
+            overflow = column.get("overflow", "clip")
+            if overflow not in OVERFLOWS:
+                raise TemplateError(f"{self.name}: unknown overflow '{overflow}' in table '{section['name']}'")
+            columns.append([column.get("field"), column["heading"], column["width"] * inch,
+                            self._align(column), overflow])
+        total_width = sum(column[2] for column in columns)
+        x = self._x(section["x"]) if "x" in section else (self.width - total_width) / 2
+        return {
+            "key": section["key"],
+            "columns": columns,
+            "x": x,
+            "header_height": section["header_height"] * inch,
+            "row_height": section["row_height"] * inch,
+            "text_offset": section["text_offset"] * inch,
+            "header_baselines": {lines: [offset * inch for offset in offsets]
+                                 for lines, offsets in section["header_baselines"].items()},
+            "font": list(section.get("font", ("Helvetica", 9))),
+            "header_font": list(section.get("header_font", ("Helvetica-Bold", 9))),
+            "space_after": section.get("space_after", 0) * inch,
+        }
+
+    # Elements: each takes (element, current line, static ops, section plan) and
+    # returns the current line after it
+
+    def _space(self, element, y, ops, plan):
+        return y - element["height"] * inch
+
+    def _text(self, element, y, ops, plan):
+        ops.font(self._font(element))
+        ops.fill(self._color(element.get("color", "black")))
+        ops.draw(_DRAW_TEXT[self._align(element)], self._x(element.get("x", "margin")),
+                 y + element.get("dy", 0) * inch, element["text"])
+        return y
+
+    def _paragraph(self, element, y, ops, plan):
+        font = self._font(element)
+        x = self._x(element.get("x", "margin"))
+        if "lines" in element:
+            lines = element["lines"]
+        else:
+            width = self._x(element["width"]) if "width" in element else self.width - self.margin - x
+            lines = wrap_text(element["text"], font[0], font[1], width)
+
+        ops.font(font)
+        ops.fill(self._color(element.get("color", "black")))
+        leading = element["leading"] * inch
+        for line in lines:
+            ops.draw("drawString", x, y, line)
+            y -= leading
+        return y
+
+    def _line(self, element, y, ops, plan):
+        ops.stroke(self._color(element.get("color", "black")))
+        if "line_width" in element:
+            ops.line_width(element["line_width"])
+        line_y = y + element.get("dy", 0) * inch
+        ops.draw("line", self._x(element.get("x", "margin")), line_y, self._x(element["x2"]), line_y)
+        return y
+
+    def _rect(self, element, y, ops, plan):
+        ops.stroke(self._color(element.get("color", "black")))
+        if "line_width" in element:
+            ops.line_width(element["line_width"])
+        fill = element.get("fill")
+        if fill:
+            ops.fill(self._color(fill))
+        ops.draw("rect", self._x(element.get("x", "margin")), y + element.get("dy", 0) * inch,
+                 element["width"] * inch, element["height"] * inch, 1, 1 if fill else 0)
+        return y
+
+    def _image(self, element, y, ops, plan):
+        source = element["source"]
+        if source not in IMAGES:
+            raise TemplateError(f"{self.name}: unknown image '{source}'")
+        plan["images"].append([source, self._x(element.get("x", "margin")), y + element.get("dy", 0) * inch,
+                               element["width"] * inch, element["height"] * inch])
+        return y
+
+    def _field(self, element, y, ops, plan):
+        key = element["key"]
+        font_name, size = self._font(element)
+        max_width = element.get("max_width")
+        plan["dynamic"].append([
+            "field", key, self._x(element.get("x", "margin")), y + element.get("dy", 0) * inch,
+            font_name, size, self._color(element.get("color", "black")), self._align(element),
+            max_width * inch if max_width is not None else None,
+        ])
+        plan["inputs"].append(key)
+        return y
+
+    def _radio_circle(self, x: float, y: float, ops: _Ops):
+        """Draw an empty radio button circle for the option at (x, y)"""
+        ops.stroke(self._color("black"))
+        ops.draw("circle", x + self.radio_offset[0], y + self.radio_offset[1], self.radio_radius, 1, 0)
+
+    def _choice(self, element, y, ops, plan):
+        """A radio group drawn on the page, with the option chosen in the data filled in"""
+        key = element["key"]
+        x = self._x(element.get("x", "margin"))
+        top = y + element.get("dy", 0) * inch
+        font = self._font(element)
+        color = self._color(element.get("color", "black"))
+        spacing = element["spacing"] * inch
+        label_x = x + element.get("label_x", 0.22) * inch
+        sup = element.get("sup", {})
+
+        options = []
+        for i, option in enumerate(element["options"]):
+            if isinstance(option, str):
+                option = {"label": option}
+            option_y = top - i * spacing
+
+            self._radio_circle(x, option_y, ops)
+            ops.font(font)
+            ops.fill(color)
+            ops.draw("drawString", label_x, option_y, option["label"])
+            if "sup" in option:
+                ops.font((font[0], sup.get("size", 6)))
+                ops.draw("drawString", label_x + sup.get("dx", 0.08) * inch,
+                         option_y + sup.get("dy", 0.06) * inch, option["sup"])
+
+            other = option.get("other")
+            if other is not None:
+                line_x1, line_x2 = other["line"]
+                other = [other["key"], x + line_x1 * inch, x + line_x2 * inch, option_y - 0.04 * inch,
+                         x + other.get("x", line_x1 + 0.02) * inch, option_y]
+                plan["inputs"].append(other[0])
+            options.append([option.get("value", option["label"]), x + self.radio_offset[0],
+                            option_y + self.radio_offset[1], other])
+
+        plan["dynamic"].append(["choice", key, options, self.radio_dot, list(font)])
+        plan["inputs"].append(key)
+        return y
+
+    def _radio_button(self, element, y, ops, plan):
+        """One option of an interactive radio button group, filled in by the reader"""
+        x = self._x(element.get("x", "margin"))
+        y_button = y + element.get("dy", 0) * inch
+        self._radio_circle(x, y_button, ops)
+
+        size = self.radio_widget
+        plan["dynamic"].append([
+            "radio_button", element["group"], element["value"],
+            x + self.radio_offset[0] - size / 2, y_button + self.radio_offset[1] - size / 2, size,
+        ])
+        return y
+
+    def _signature(self, element, y, ops, plan):
+        """Where the digital signature field goes (the box itself is drawn with a rect)"""
+        plan["dynamic"].append([
+            "signature", element["name"], self._x(element.get("x", "margin")),
+            y + element.get("dy", 0) * inch, element["width"] * inch, element["height"] * inch,
+        ])
+        return y
+
+
+_ELEMENTS = ("space", "text", "paragraph", "line", "rect", "image", "field", "choice", "radio_button", "signature")
+
+
+def compile_template(name: str, template: dict) -> dict:
+    """Compile a parsed template into a plan (plain JSON-compatible data)"""
+    try:
+        return _Compiler(name, template).compile()
+    except (KeyError, TypeError, ValueError) as e:
+        if isinstance(e, TemplateError):
+            raise
+        raise TemplateError(f"{name}: bad template ({e!r})") from None
+
+
+def _write_plan(path: str, plan: dict):
+    """Write a compiled plan to the cache, replacing any older plans for the same template"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".plan.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(plan, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    prefix = os.path.basename(path).rsplit("-", 1)[0]
+    for old_path in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(prefix)}-*.json")):
+        if old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+def _load_plan(name: str) -> RenderPlan:
+    with open(os.path.join(get_templates_path(), f"{name}.json"), "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(b"%d\n" % PLAN_VERSION + source).hexdigest()[:16]
+    path = os.path.join(get_cache_path(), "plans", f"{name}-{digest}.json")
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        plan = compile_template(name, json.loads(source))
+        plan["hash"] = digest
+        try:
+            _write_plan(path, plan)
+        except OSError:
+            pass  # the cache only saves time; the plan is still good to use
+
+    return RenderPlan(plan)
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def load_plan(name: str) -> RenderPlan:
+    """
+    Get the process-wide render plan for the template Forms/templates/<name>.json,
+    compiling it (and caching the result on disk) only if the template changed
+    """
+    plan = _plans.get(name)
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(name)
+            if plan is None:
+                plan = _plans[name] = _load_plan(name)
+    return plan
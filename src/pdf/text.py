@@ -0,0 +1,122 @@
+"""
+Text Measurement
+Glyph widths are cached per font, so measuring and truncating text costs a
+dictionary lookup per character. Truncation finds the cut point by binary
+search over the running widths instead of re-measuring the string for every
+character removed, and word wrapping adds up word widths as it goes.
+Wrapped paragraphs are memoized, since form text rarely changes
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+
+
+class FontMetrics:
+    """Cached glyph widths for one font, in units of 1/1000 of the font size"""
+
+    def __init__(self, font_name: str):
+        self.font = pdfmetrics.getFont(font_name)
+        self._widths = {}
+
+    def _measure(self, char: str) -> float:
+        # reportlab adds up whole-unit glyph widths, so round away float noise
+        width = self._widths[char] = round(self.font.stringWidth(char, 1000), 3)
+        return width
+
+    def units(self, text: str) -> float:
+        """Width of text in 1/1000 font units"""
+        try:
+            return sum(map(self._widths.__getitem__, text))
+        except KeyError:
+            for char in set(text).difference(self._widths):
+                self._measure(char)
+            return sum(map(self._widths.__getitem__, text))
+
+    def string_width(self, text: str, size: float) -> float:
+        """Width of text in points, the same as reportlab's stringWidth"""
+        return self.units(text) * 0.001 * size
+
+    def truncate(self, text: str, max_width: float, size: float, suffix: str = "...") -> str:
+        """
+        Cut text to fit within max_width points, ending it with suffix if anything
+        was cut. Returns an empty string if not even one character fits.
+        """
+        # Most text fits, and adding up its widths in one go is much quicker
+        if self.units(text) * 0.001 * size <= max_width:
+            return text
+
+        widths = self._widths
+        # Running widths, only as far as the text fits - the rest can't be kept anyway
+        prefix = []
+        total = 0
+        for char in text:
+            width = widths.get(char)
+            total += width if width is not None else self._measure(char)
+            if total * 0.001 * size > max_width:
+                break
+            prefix.append(total)
+        else:
+            return text
+
+        # Longest prefix that still fits with the suffix after it
+        suffix_units = self.units(suffix)
+        count = bisect_right(prefix, max_width * 1000 / size - suffix_units)
+        # Settle the boundary with the same arithmetic as reportlab's stringWidth
+        while count and (prefix[count - 1] + suffix_units) * 0.001 * size > max_width:
+            count -= 1
+        while count < len(prefix) and (prefix[count] + suffix_units) * 0.001 * size <= max_width:
+            count += 1
+        return text[:count] + suffix if count else ""
+
+    def wrap(self, text: str, max_width: float, size: float) -> tuple:
+        """
+        Greedy word wrap into lines no wider than max_width points (a word wider
+        than that gets a line of its own). Words are separated by single spaces.
+        """
+        space_units = self.units(" ")
+        lines = []
+        line = []
+        line_units = 0
+        for word in text.split():
+            word_units = self.units(word)
+            if line and (line_units + space_units + word_units) * 0.001 * size > max_width:
+                lines.append(" ".join(line))
+                line = [word]
+                line_units = word_units
+            else:
+                line_units += word_units + (space_units if line else 0)
+                line.append(word)
+        if line:
+            lines.append(" ".join(line))
+        return tuple(lines)
+
+
+_metrics = {}
+
+
+def get_font_metrics(font_name: str) -> FontMetrics:
+    """Get the process-wide metrics for a registered font"""
+    metrics = _metrics.get(font_name)
+    if metrics is None:
+        metrics = _metrics.setdefault(font_name, FontMetrics(font_name))
+    return metrics
+
+
+def string_width(text: str, font_name: str, size: float) -> float:
+    """Width of text in points"""
+    return get_font_metrics(font_name).string_width(text, size)
+
+
+def truncate_text(text: str, max_width: float, font_name: str, size: float, suffix: str = "...") -> str:
+    """Cut text to fit within max_width points, ending it with suffix if anything was cut"""
+    if not text:
+        return ""
+    return get_font_metrics(font_name).truncate(text, max_width, size, suffix)
+
+
+@lru_cache(maxsize=4096)
+def wrap_text(text: str, font_name: str, size: float, max_width: float) -> tuple:
+    """Word-wrap text into a tuple of lines no wider than max_width points (memoized)"""
+    return get_font_metrics(font_name).wrap(text, max_width, size)
@@ -0,0 +1,191 @@
+"""
+Draft Journal
+Edits to a form in progress are appended to a journal file, one JSON record
+per line, by a background thread, so a crash loses at most the last few
+keystrokes. The journal is periodically compacted into a single snapshot
+record, which keeps it quick to read back on startup
+"""
+
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import traceback
+
+
+COMPACT_AFTER = 2000  # records appended before the journal is rewritten as a snapshot
+
+
+def _apply(draft: dict, op: str, data):
+    """
+    Apply one journal record to a draft ({"fields": dict, "rows": {row id: row dict}},
+    rows in display order): snapshot (the whole draft, rows as (id, row) pairs),
+    fields (all form fields), replace (all rows as (id, row) pairs), add ((id, row)
+    pairs appended), remove (row ids) or set ((row id, field, value)).
+    """
+    if op == "snapshot":
+        draft["fields"] = dict(data["fields"])
+        draft["rows"] = {row_id: dict(row) for row_id, row in data["rows"]}
+    elif op == "fields":
+        draft["fields"] = dict(data)
+    elif op == "replace":
+        draft["rows"] = {row_id: dict(row) for row_id, row in data}
+    elif op == "add":
+        draft["rows"].update((row_id, dict(row)) for row_id, row in data)
+    elif op == "remove":
+        rows = draft["rows"]
+        for row_id in data:
+            del rows[row_id]
+    elif op == "set":
+        row_id, field, value = data
+        draft["rows"][row_id][field] = value
+    else:
+        raise ValueError(f"Unknown draft record '{op}'")
+
+
+def has_draft(path: str) -> bool:
+    """Whether the journal at path holds a form with anything filled in"""
+    draft = DraftJournal(path).load()
+    return any(draft["fields"].values()) or any(any(row.values()) for row in draft["rows"])
+
+
+class DraftJournal:
+    """Append-only journal of the edits made to one form"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._draft = {"fields": {}, "rows": {}}
+        self._records = 0        # records in the file after its snapshot
+        self._rewrite = False    # the file needs rewriting before appending to it
+        self._last_fields = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def load(self) -> dict:
+        """
+        Read the saved draft as {"fields": dict, "rows": list of dicts}, empty
+        if there is none. Call before recording any edits.
+        """
+        draft = {"fields": {}, "rows": {}}
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return {"fields": {}, "rows": []}
+
+        with f:
+            for line in f:
+                try:
+                    op, data = json.loads(line)
+                    _apply(draft, op, data)
+                except (ValueError, TypeError, IndexError, KeyError):
+                    # A record cut short by a crash ends the journal
+                    self._rewrite = True
+                    break
+                self._records += 1
+
+        self._draft = draft
+        self._last_fields = draft["fields"]
+        return {"fields": dict(draft["fields"]), "rows": [dict(row) for row in draft["rows"].values()]}
+
+    def record(self, op: str, data):
+        """
+        Queue an edit (see _apply for the record types) to be written in the
+        background. Rows are named by the grid's item ids, which only last as
+        long as the grid, so a restored draft starts with a replace under new ids.
+        """
+        if op == "fields":
+            if data == self._last_fields:
+                return
+            data = self._last_fields = dict(data)
+        elif op in ("add", "replace"):
+            # The writer gets copies; the grid goes on editing its own row dicts
+            data = [(row_id, dict(row)) for row_id, row in data]
+        elif op == "remove":
+            data = list(data)
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="draft-journal", daemon=True)
+            self._thread.start()
+        self._queue.put((op, data))
+
+    def close(self):
+        """Write any queued edits and stop the background thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Writer thread: append queued records, compacting the journal when it grows"""
+        f = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = None in batch
+                records = [record for record in batch if record is not None]
+                for op, data in records:
+                    try:
+                        _apply(self._draft, op, data)
+                    except Exception:
+                        self._failed(f"apply a '{op}' record to")
+
+                try:
+                    # A replace makes every earlier record redundant
+                    if (self._rewrite or any(op == "replace" for op, _ in records)
+                            or self._records + len(records) >= COMPACT_AFTER):
+                        if f is not None:
+                            f.close()
+                            f = None
+                        self._write_snapshot()
+                    elif records:
+                        if f is None:
+                            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                            f = open(self.path, "a", encoding="utf-8", newline="\n")
+                        f.write("".join(json.dumps(record) + "\n" for record in records))
+                        f.flush()
+                        os.fsync(f.fileno())
+                        self._records += len(records)
+                except Exception:
+                    self._failed("save")
+
+                if stop:
+                    return
+        finally:
+            if f is not None:
+                f.close()
+
+    def _failed(self, action: str):
+        """
+        Report a failure in the writer thread. Drafts are a safety net; failing to
+        save one mustn't stop the form being used, or stop this thread. The file
+        is then rewritten in full from the draft.
+        """
+        print(f"Failed to {action} the draft journal {self.path}:", file=sys.stderr)
+        traceback.print_exc()
+        self._rewrite = True
+
+    def _write_snapshot(self):
+        """Replace the journal with a single snapshot of the current draft"""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".draft.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+                snapshot = {"fields": self._draft["fields"], "rows": list(self._draft["rows"].items())}
+                f.write(json.dumps(["snapshot", snapshot]) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self._records = 0
+        self._rewrite = False
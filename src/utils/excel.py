@@ -0,0 +1,141 @@
+"""
+Excel Import
+Workbooks are opened in openpyxl's read-only mode and rows are parsed lazily
+from the worksheet as they are consumed, so memory use stays small however
+many rows the sheet has
+"""
+
+import importlib.util
+
+
+# openpyxl is only imported when a workbook is actually read
+EXCEL_SUPPORT = importlib.util.find_spec("openpyxl") is not None
+
+ITEM_FIELDS = ["store_code", "description", "qty", "purchase_date"]
+ASSET_FIELDS = ["store_code", "asset_name", "description", "old_asset_no"]
+
+
+def map_item_headers(headers) -> dict:
+    """Map acknowledgment item headers to fields (case-insensitive), by column index"""
+    header_map = {}
+    for i, h in enumerate(headers):
+        if h is None:
+            continue
+        h_lower = str(h).lower().strip()
+        if "store" in h_lower or "code" in h_lower:
+            header_map["store_code"] = i
+        elif "description" in h_lower or "item" in h_lower:
+            header_map["description"] = i
+        elif "qty" in h_lower or "quantity" in h_lower:
+            header_map["qty"] = i
+        elif "date" in h_lower or "lpo" in h_lower or "purchase" in h_lower:
+            header_map["purchase_date"] = i
+
+    # Unrecognised columns fall back to the default column order
+    for i, field in enumerate(ITEM_FIELDS):
+        header_map.setdefault(field, i)
+    return header_map
+
+
+def map_asset_headers(headers) -> dict:
+    """Map transfer asset headers to fields (case-insensitive), by column index"""
+    header_map = {}
+    for i, h in enumerate(headers):
+        if h is None:
+            continue
+        h_lower = str(h).lower().strip()
+        if "store" in h_lower or "code" in h_lower:
+            header_map["store_code"] = i
+        elif "asset" in h_lower and "name" in h_lower:
+            header_map["asset_name"] = i
+        elif "description" in h_lower or "desc" in h_lower:
+            header_map["description"] = i
+        elif "old" in h_lower or "asset no" in h_lower:
+            header_map["old_asset_no"] = i
+
+    # Unrecognised columns fall back to the default column order
+    for i, field in enumerate(ASSET_FIELDS):
+        header_map.setdefault(field, i)
+    return header_map
+
+
+def cell_text(row_values: tuple, index) -> str:
+    """Get a cell as stripped text, empty if the column is missing"""
+    if index is None or index >= len(row_values):
+        return ""
+    value = row_values[index]
+    return str(value).strip() if value is not None else ""
+
+
+def iter_sheet_rows(filepath: str):
+    """
+    Yield the rows of the active worksheet as tuples of values, header row first.
+    The workbook is closed when the rows run out or the generator is closed.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def read_records(filepath: str, map_headers, fields: list):
+    """
+    Read the header row and return (row_count, records): the number of data rows
+    the sheet declares (None if it doesn't say) and an iterator of {field: text}
+    dicts, one per non-empty data row. Close records when done with it (it
+    closes itself when the rows run out). Raises ValueError straight away if
+    there are no headers.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers or not any(headers):
+            raise ValueError("No headers found in the Excel file.")
+        row_count = ws.max_row - 1 if ws.max_row else None
+        header_map = map_headers(headers)
+    except BaseException:
+        wb.close()
+        raise
+
+    return row_count, Records(wb, rows, header_map, fields)
+
+
+class Records:
+    """
+    The data rows of an open workbook as field dicts, skipping empty rows.
+    Owns the workbook: close() releases it whether or not reading has started.
+    """
+
+    def __init__(self, wb, rows, header_map: dict, fields: list):
+        self._wb = wb
+        self._rows = rows
+        self._header_map = header_map
+        self._fields = fields
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        if self._wb is not None:
+            header_map = self._header_map
+            for row_values in self._rows:
+                if not row_values or not any(row_values):
+                    continue
+                return {field: cell_text(row_values, header_map.get(field)) for field in self._fields}
+            self.close()
+        raise StopIteration
+
+    def close(self):
+        """Close the workbook (safe to call more than once)"""
+        wb, self._wb = self._wb, None
+        if wb is not None:
+            # The row reader holds the worksheet's file open until it is closed too
+            self._rows.close()
+            wb.close()
@@ -0,0 +1,134 @@
+"""
+Output File Allocation
+Unique output filenames ("name.pdf", "name (#2).pdf", ...) are handed out from
+an index of the suffixes already used in each directory. Contents are written
+to a hidden temporary file and only published under a final name once
+complete, with a hard link that never replaces an existing file, so parallel
+writers never get the same name and a crash never leaves a partial file behind
+under one
+"""
+
+import os
+import re
+import threading
+import uuid
+
+
+# "name (#3).pdf" -> base "name", counter 3
+_NUMBERED = re.compile(r"^(?P<base>.*) \(#(?P<counter>\d+)\)$")
+
+TEMP_SUFFIX = ".tmp"  # temp files are ".<filename>.<random>.tmp"
+
+
+class OutputDirectory:
+    """Per-directory index of the next free (#n) suffix for each base filename"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._next_counter = {}  # (base, ext) key -> next counter to try
+        self._lock = threading.Lock()
+        self._scan()
+
+    @staticmethod
+    def _key(base: str, ext: str) -> tuple:
+        return (os.path.normcase(base), os.path.normcase(ext))
+
+    def _scan(self):
+        """Index the existing files with a single directory listing"""
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") and entry.name.endswith(TEMP_SUFFIX):
+                    continue
+                base, ext = os.path.splitext(entry.name)
+                counter = 1
+                match = _NUMBERED.match(base)
+                if match:
+                    base, counter = match.group("base"), int(match.group("counter"))
+                key = self._key(base, ext)
+                if counter >= self._next_counter.get(key, 1):
+                    self._next_counter[key] = counter + 1
+
+    def publish(self, temp_path: str, filename: str) -> str:
+        """
+        Give the complete file temp_path a unique name based on filename and return
+        its path. The first copy keeps the plain name; later ones get (#2), (#3), etc.
+        """
+        base, ext = os.path.splitext(filename)
+        key = self._key(base, ext)
+
+        with self._lock:
+            counter = self._next_counter.get(key, 1)
+            while True:
+                name = filename if counter == 1 else f"{base} (#{counter}){ext}"
+                filepath = os.path.join(self.path, name)
+                try:
+                    # Fails if another process (or a file the index missed) got there first
+                    os.link(temp_path, filepath)
+                except FileExistsError:
+                    counter += 1
+                    continue
+                except OSError:
+                    # No hard links on this file system (e.g. FAT): claim the name with an
+                    # exclusive create and move the file over it, so the name is only
+                    # empty for that moment
+                    try:
+                        fd = os.open(filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+                    except FileExistsError:
+                        counter += 1
+                        continue
+                    os.close(fd)
+                    os.replace(temp_path, filepath)
+                self._next_counter[key] = counter + 1
+                break
+
+        # The file is published; a temp name left behind can only waste space
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return filepath
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def _open_temp(output_dir: str, filename: str):
+    """Create a hidden temp file for filename in output_dir, returning (path, binary file)"""
+    while True:
+        temp_path = os.path.join(output_dir, f".{filename}.{uuid.uuid4().hex[:8]}{TEMP_SUFFIX}")
+        try:
+            # Created like any other file (0o666 less the umask), unlike mkstemp's 0o600
+            fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+        except FileExistsError:
+            continue
+        return temp_path, os.fdopen(fd, "wb")
+
+
+def write_output_file(output_dir: str, filename: str, write) -> str:
+    """
+    Write a file with write(f), f open for binary writing, and publish it in
+    output_dir under filename, adding (#2), (#3), etc. if that is taken. Returns
+    the file's path. Until write returns, nothing exists under a final name, and
+    if it raises the temp file is removed.
+    """
+    key = os.path.normcase(os.path.abspath(output_dir))
+    with _directories_lock:
+        directory = _directories.get(key)
+        if directory is None:
+            directory = _directories[key] = OutputDirectory(output_dir)
+
+    temp_path, f = _open_temp(output_dir, filename)
+    try:
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        return directory.publish(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            # Already gone, or can't be removed; either way the original error matters more
+            pass
+        raise
@@ -81,3 +81,18 @@ def get_output_path() -> str:
     output_dir = os.path.join(get_base_path(), "output")
     os.makedirs(output_dir, exist_ok=True)
     return output_dir
+
+
+def get_drafts_path() -> str:
+    """Returns path to the directory where unsaved form drafts are kept"""
+    return os.path.join(get_base_path(), "drafts")
+
+
+def get_templates_path() -> str:
+    """Returns path to the directory of form templates"""
+    return get_resource_path(os.path.join("Forms", "templates"))
+
+
+def get_cache_path() -> str:
+    """Returns path to the directory where compiled form templates are cached"""
+    return os.path.join(get_base_path(), "cache")
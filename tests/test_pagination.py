@@ -0,0 +1,71 @@
+"""
+Page counts of generated forms, checked against the original layout. Before
+the table engine and templates, the acknowledgment table stopped 4 inches above
+the bottom margin on every page and the footer needed 4.5 inches below the
+last row, and rows never grew to fit their text
+"""
+
+import pytest
+
+from src.pdf import template
+from src.pdf.acknowledgment_pdf import AcknowledgmentPDFGenerator
+from src.pdf.display_list import SectionCache
+from src.pdf.transfer_pdf import TransferPDFGenerator
+
+
+# Pages the original generators took for 1 to 30 rows
+BASELINE_ACKNOWLEDGMENT = [1] * 8 + [2] * 18 + [3] * 4
+BASELINE_TRANSFER = [1] * 10 + [2] * 20
+
+ITEM = {"store_code": "AU-1042", "description": "Dell OptiPlex 7010", "qty": "1", "purchase_date": "LPO 5521"}
+ASSET = {"store_code": "AU-1042", "asset_name": "Desktop", "description": "Dell OptiPlex 7010", "old_asset_no": "A-77"}
+
+# Wraps onto a second line in the acknowledgment's description column
+LONG_DESCRIPTION = "Dell OptiPlex 7010 desktop computer with 27 inch monitor and keyboard"
+
+
+def page_count(generator, key: str, row: dict, count: int) -> int:
+    form_data = {key: [dict(row) for _ in range(count)]}
+    return generator.draw_preview(form_data, SectionCache()).page_count
+
+
+@pytest.fixture(scope="module", autouse=True)
+def plan_cache(tmp_path_factory):
+    """Cache the compiled templates in a temporary directory, not the working tree"""
+    cache_path = str(tmp_path_factory.mktemp("cache"))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(template, "get_cache_path", lambda: cache_path)
+        yield
+
+
+@pytest.fixture(scope="module")
+def acknowledgment():
+    return AcknowledgmentPDFGenerator()
+
+
+@pytest.fixture(scope="module")
+def transfer():
+    return TransferPDFGenerator()
+
+
+@pytest.mark.parametrize("count", range(1, 31))
+def test_acknowledgment_takes_no_more_pages_than_baseline(acknowledgment, count):
+    assert page_count(acknowledgment, "items", ITEM, count) <= BASELINE_ACKNOWLEDGMENT[count - 1]
+
+
+@pytest.mark.parametrize("count", range(1, 31))
+def test_transfer_takes_no_more_pages_than_baseline(transfer, count):
+    assert page_count(transfer, "assets", ASSET, count) <= BASELINE_TRANSFER[count - 1]
+
+
+@pytest.mark.parametrize("count", range(1, 6))
+def test_wrapped_descriptions_keep_a_short_form_on_one_page(acknowledgment, count):
+    item = dict(ITEM, description=LONG_DESCRIPTION)
+    assert page_count(acknowledgment, "items", item, count) == 1
+
+
+@pytest.mark.parametrize("count", range(1, 31))
+def test_wrapped_descriptions_add_at_most_one_page(acknowledgment, count):
+    # The original layout drew long descriptions past the edge of their cells
+    item = dict(ITEM, description=LONG_DESCRIPTION)
+    assert page_count(acknowledgment, "items", item, count) <= BASELINE_ACKNOWLEDGMENT[count - 1] + 1